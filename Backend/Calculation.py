@@ -6,56 +6,141 @@ Data is loaded from MongoDB (Scoring database) via DataAccess.
 from __future__ import annotations
 
 import csv
+import heapq
+import io
+import math
+from bisect import bisect_right
+from collections.abc import Iterator
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
-from DataAccess import load_entries, load_event_info, load_finishes, load_race_info
+from DataAccess import (
+    ENTRY_SCORING_FIELDS,
+    EVENT_SCORING_FIELDS,
+    RACE_SCORING_FIELDS,
+    load_entries,
+    load_event_by_id,
+    load_positions,
+    load_race_info,
+    load_rc_scoring_finishes,
+    run_concurrently,
+)
+
+_INF = float("inf")
+_EMPTY: dict[str, Any] = {}  # shared read-only default for missing lookups
+
+
+def _race_index(race_order: list[str]) -> dict[str, int]:
+    """Column index per race_id (first occurrence if a race_id is listed twice)."""
+    race_index: dict[str, int] = {}
+    for i, rid in enumerate(race_order):
+        race_index.setdefault(rid, i)
+    return race_index
+
+
+def _fill_repeated_races(
+    positions: dict[str, list[float | None]],
+    race_order: list[str],
+    race_index: dict[str, int],
+) -> None:
+    """A race_id listed twice in race_order gets the same position in both columns."""
+    repeated = [(i, race_index[rid]) for i, rid in enumerate(race_order) if race_index[rid] != i]
+    if repeated:
+        for row in positions.values():
+            for i, first in repeated:
+                row[i] = row[first]
 
 
 def positions_from_finishes(
     finishes: list[dict[str, Any]],
     race_order: list[str],
-) -> tuple[dict[str, dict[str, float]], list[tuple[str, str, str]]]:
+) -> tuple[dict[str, list[float | None]], list[tuple[str, str, str]]]:
     """
     Build per-boat, per-race position (1-based) from finish data.
     For each race, sort by finish_time and assign 1, 2, 3, ... to finishes that
     do NOT have rc_scoring. Finishes with rc_scoring are not counted for position
     (they get a penalty score elsewhere) and are returned in rc_scoring_finishes.
-    Returns (positions, rc_scoring_finishes) where rc_scoring_finishes is
-    list of (sail_number, race_id, rc_scoring_code).
+    Returns (positions, rc_scoring_finishes) where positions maps sail_number to a
+    list aligned with race_order (None = no position in that race) and
+    rc_scoring_finishes is list of (sail_number, race_id, rc_scoring_code).
     """
-    # Group finishes by race_id
-    by_race: dict[str, list[dict]] = {rid: [] for rid in race_order}
-    for f in finishes:
-        rid = f.get("race_id")
-        if rid in by_race:
-            by_race[rid].append(f)
-
-    rc_scoring_finishes: list[tuple[str, str, str]] = []
-
-    # Assign positions per race (earliest finish = 1); exclude rc_scoring from ranking
-    positions: dict[str, dict[str, float]] = {}
-    for rid in race_order:
-        with_rc = [(f, f.get("rc_scoring")) for f in by_race[rid]]
-        # Finishes with rc_scoring: record for penalty score, do not assign position
-        for f, rc in with_rc:
-            if rc:
-                sn = f.get("sail_number")
-                if sn is not None:
-                    rc_scoring_finishes.append((str(sn), str(rid), str(rc).strip()))
-        # Only assign 1, 2, 3, ... to finishes without rc_scoring
-        normal_finishes = sorted(
-            [f for f, rc in with_rc if not rc],
-            key=lambda x: x.get("finish_time", ""),
-        )
-        for pos, fin in enumerate(normal_finishes, start=1):
-            sn = fin.get("sail_number")
-            if sn is None:
-                continue
-            if sn not in positions:
-                positions[sn] = {}
-            positions[sn][rid] = float(pos)
+    race_index = _race_index(race_order)
+    n_races = len(race_order)
+
+    # One pass over finishes: extract the fields once into plain tuples.
+    # seq keeps input order for equal finish_times (same as a stable sort).
+    normal: list[tuple[int, Any, int, Any]] = []
+    rc_rows: list[tuple[int, int, str, str, str]] = []
+    # Bound methods: one lookup per finish for membership + index, no attribute resolution
+    race_index_get = race_index.get
+    normal_append = normal.append
+    for seq, f in enumerate(finishes):
+        ri = race_index_get(f.get("race_id"))
+        if ri is None:
+            continue
+        rc = f.get("rc_scoring")
+        if rc:
+            # Finishes with rc_scoring: record for penalty score, do not assign position
+            sn = f.get("sail_number")
+            if sn is not None:
+                rc_rows.append((ri, seq, str(sn), str(race_order[ri]), str(rc).strip()))
+        else:
+            normal_append((ri, f.get("finish_time", ""), seq, f.get("sail_number")))
+
+    # Single sort by (race, finish_time); tuples compare natively, no key function
+    normal.sort()
+    rc_rows.sort()
+    rc_scoring_finishes = [(sn, rid, code) for _ri, _seq, sn, rid, code in rc_rows]
+
+    # Assign positions per race block (earliest finish = 1); rc_scoring excluded above
+    positions: dict[str, list[float | None]] = {}
+    current_ri = -1
+    pos = 0
+    for ri, _ft, _seq, sn in normal:
+        if ri != current_ri:
+            current_ri = ri
+            pos = 0
+        pos += 1
+        if sn is None:
+            continue
+        row = positions.get(sn)
+        if row is None:
+            row = positions[sn] = [None] * n_races
+        row[ri] = float(pos)
+
+    _fill_repeated_races(positions, race_order, race_index)
+    return (positions, rc_scoring_finishes)
+
 
+def positions_from_ranked(
+    ranked: list[dict[str, Any]],
+    rc_finishes: list[dict[str, Any]],
+    race_order: list[str],
+) -> tuple[dict[str, list[float | None]], list[tuple[str, str, str]]]:
+    """
+    Same result as positions_from_finishes, built from positions already computed by
+    MongoDB (DataAccess.load_positions) plus the rc_scoring finishes. No sorting needed.
+    """
+    race_index = _race_index(race_order)
+    n_races = len(race_order)
+    positions: dict[str, list[float | None]] = {}
+    for p in ranked:
+        sn = p.get("sail_number")
+        ri = race_index.get(p.get("race_id"))
+        if sn is None or ri is None:
+            continue
+        row = positions.get(sn)
+        if row is None:
+            row = positions[sn] = [None] * n_races
+        row[ri] = float(p["position"])
+    _fill_repeated_races(positions, race_order, race_index)
+
+    rc_scoring_finishes = [
+        (str(f["sail_number"]), str(f.get("race_id")), str(f["rc_scoring"]).strip())
+        for f in rc_finishes
+        if f.get("sail_number") is not None
+    ]
     return (positions, rc_scoring_finishes)
 
 
@@ -66,7 +151,8 @@ def num_discards(n_races: int, discard_thresholds: list[int]) -> int:
     """
     if not discard_thresholds:
         return 0
-    return sum(1 for t in discard_thresholds if n_races >= t)
+    # Thresholds are normally ascending already; sorted() is then one C-level pass
+    return bisect_right(sorted(discard_thresholds), n_races)
 
 
 def total_and_net(
@@ -83,24 +169,21 @@ def total_and_net(
     scored: list[tuple[float, int]] = [
         (s, i) for i, s in enumerate(race_scores) if s is not None
     ]
-    total = sum(s for s, _ in scored)
+    total = math.fsum(s for s, _ in scored)
     n = len(scored)
     is_discarded = [False] * len(race_scores)
 
     if num_discards <= 0 or n == 0:
         return (total, total, is_discarded)
 
-    # Sort by worst first: higher score first, then higher index (later race)
+    # Worst k by natural (score, index) order: higher score first, then higher index
+    # (later race). heapq.nlargest is O(n log k) and needs no key function.
     to_discard = min(num_discards, n)
-    sorted_by_worst = sorted(scored, key=lambda x: (-x[0], -x[1]))
-    discard_indices = {sorted_by_worst[i][1] for i in range(to_discard)}
-    for i in discard_indices:
+    worst = heapq.nlargest(to_discard, scored)
+    for _s, i in worst:
         is_discarded[i] = True
 
-    discarded_sum = sum(
-        race_scores[i] for i in range(len(race_scores)) if is_discarded[i] and race_scores[i] is not None
-    )
-    net = total - discarded_sum
+    net = total - math.fsum(s for s, _ in worst)
     return (total, net, is_discarded)
 
 
@@ -114,15 +197,13 @@ def _a8_compare_key(
     Missing (None) counts as worst for tie-break. Returns (a8_1_key, a8_2_key) for sort key.
     """
     # A8.1: non-discarded scores, sorted best (lowest) to worst
-    non_discarded = [
-        race_scores[i] for i in range(len(race_scores))
-        if race_scores[i] is not None and not is_discarded[i]
-    ]
-    a8_1 = tuple(sorted(non_discarded))
+    a8_1 = tuple(sorted(
+        s for s, d in zip(race_scores, is_discarded) if s is not None and not d
+    ))
 
     # A8.2: last race, next-to-last, ...; use inf for missing so missing is worse
     a8_2 = tuple(
-        s if s is not None else float("inf")
+        s if s is not None else _INF
         for s in reversed(race_scores)
     )
 
@@ -135,6 +216,8 @@ def build_series_result(
     races: list[dict[str, Any]],
     finishes: list[dict[str, Any]],
     event_info: dict[str, Any],
+    *,
+    positions: tuple[dict[str, list[float | None]], list[tuple[str, str, str]]] | None = None,
 ) -> list[dict[str, Any]]:
     """
     Build ranked result rows for the event. Each row has: sail_number, rank, rank_display,
@@ -142,15 +225,19 @@ def build_series_result(
     The result always includes every entry from the Entry collection for this event.
     Boats not marked in ScoreSample for a race are scored as DNC (Did Not Compete),
     using the same penalty as rc_scoring (n_boats + 1).
+    If positions (from positions_from_ranked) is given, finishes is not used.
     """
     race_order = [r["race_id"] for r in races]
-    score_matrix, rc_scoring_finishes = positions_from_finishes(finishes, race_order)
+    if positions is None:
+        positions = positions_from_finishes(finishes, race_order)
+    score_matrix, rc_scoring_finishes = positions
     discard_thresholds = event_info.get("discard") or []
     n_races = len(race_order)
     n_discards = num_discards(n_races, discard_thresholds)
 
     # Filter entries for this event (number of boats in series). Normalize to str so DB 1 matches "1".
-    entries_for_event = [e for e in entries if str(e.get("event_id")) == str(event_id)]
+    event_id_str = str(event_id)
+    entries_for_event = [e for e in entries if str(e.get("event_id")) == event_id_str]
     sail_numbers = [e["sail_number"] for e in entries_for_event]
     name_by_sail = {e["sail_number"]: (e.get("name") or "") for e in entries_for_event}
     if not sail_numbers:
@@ -158,42 +245,75 @@ def build_series_result(
 
     n_boats = len(sail_numbers)
     rc_penalty = n_boats + 1  # Score for rc_scoring: one more than boats in series
-    rc_display_map: dict[tuple[str, str], str] = {
-        (sn, rid): code for sn, rid, code in rc_scoring_finishes
-    }
-
-    # Per boat: race_scores in race order. Missing from ScoreSample = DNC (same penalty as rc_scoring).
-    rows_data: list[tuple[str, list[float | None], list[str | None], float, float, list[bool]]] = []
+    # rc_scoring codes by sail then race: one outer probe per boat, no tuple keys per cell
+    rc_by_sail: dict[str, dict[str, str]] = {}
+    for sn, rid, code in rc_scoring_finishes:
+        rc_by_sail.setdefault(sn, {})[rid] = code
+    # str() forms of the race ids, computed once for the rc_by_sail lookups below
+    race_keys = [str(rid) for rid in race_order]
+    no_positions: list[float | None] = [None] * n_races
+
+    # Score matrix: one row of race_scores per boat, in race order.
+    # Missing from ScoreSample = DNC (same penalty as rc_scoring).
+    score_rows: list[list[float | None]] = []
+    display_rows: list[list[str | None]] = []
     for sn in sail_numbers:
-        boat_scores = score_matrix.get(sn, {})
+        rc_sub = rc_by_sail.get(str(sn)) or _EMPTY
+        boat_positions = score_matrix.get(sn) or no_positions
         race_scores: list[float | None] = []
         rc_displays: list[str | None] = []
-        for rid in race_order:
-            if (str(sn), str(rid)) in rc_display_map:
+        for rid_key, position in zip(race_keys, boat_positions):
+            rc_display = rc_sub.get(rid_key)
+            if rc_display is not None:
                 race_scores.append(float(rc_penalty))
-                rc_displays.append(rc_display_map[(str(sn), str(rid))])
-            elif rid in boat_scores:
-                race_scores.append(boat_scores[rid])
+                rc_displays.append(rc_display)
+            elif position is not None:
+                race_scores.append(position)
                 rc_displays.append(None)
             else:
                 # Not in ScoreSample for this race = DNC (Did Not Compete), same principle as rc_scoring
                 race_scores.append(float(rc_penalty))
                 rc_displays.append("DNC")
-        total, net, is_discarded = total_and_net(race_scores, n_discards)
-        rows_data.append((sn, race_scores, rc_displays, total, net, is_discarded))
-
-    # Sort by NET (lower better), then A8
-    def sort_key(item: tuple[str, list[float | None], list[str | None], float, float, list[bool]]) -> tuple[float, tuple[tuple[float, ...], tuple[float | None, ...]]]:
-        sn, race_scores, _rc_displays, _total, net, is_discarded = item
-        a8_1, a8_2 = _a8_compare_key(race_scores, is_discarded)
-        return (net, (a8_1, a8_2))
+        score_rows.append(race_scores)
+        display_rows.append(rc_displays)
+
+    # TOTAL/NET for all boats in one pass over the matrix. n_discards is the same for
+    # every boat, so with no discards the per-boat selection is skipped entirely.
+    if n_discards > 0:
+        totals = [total_and_net(race_scores, n_discards) for race_scores in score_rows]
+    else:
+        no_discards = [False] * n_races
+        totals = [
+            (t, t, list(no_discards))
+            for t in (math.fsum(s for s in race_scores if s is not None) for race_scores in score_rows)
+        ]
+    rows_data: list[tuple[str, list[float | None], list[str | None], float, float, list[bool]]] = [
+        (sn, race_scores, rc_displays, total, net, is_discarded)
+        for sn, race_scores, rc_displays, (total, net, is_discarded)
+        in zip(sail_numbers, score_rows, display_rows, totals)
+    ]
 
-    rows_data.sort(key=sort_key)
+    # Sort by NET (lower better), then A8. The A8 key is only needed inside groups of
+    # boats tied on NET, so it is built just for those; both sorts are stable, which
+    # gives the same order as sorting on (net, a8_1, a8_2) in one go.
+    rows_data.sort(key=itemgetter(4))
+    i = 0
+    while i < len(rows_data):
+        j = i + 1
+        while j < len(rows_data) and rows_data[j][4] == rows_data[i][4]:
+            j += 1
+        if j - i > 1:
+            rows_data[i:j] = sorted(
+                rows_data[i:j], key=lambda row: _a8_compare_key(row[1], row[5])
+            )
+        i = j
 
     # Assign ranks (1st, 2nd, 3rd, ...); scores are (score, is_discarded, rc_display)
+    # Display strings for every rank, built once and indexed per row
+    rank_displays = ["", "1st", "2nd", "3rd"] + [f"{i}th" for i in range(4, len(rows_data) + 1)]
     result_rows: list[dict[str, Any]] = []
     for rank_one_based, (sn, race_scores, rc_displays, total, net, is_discarded) in enumerate(rows_data, start=1):
-        rank_display = _rank_display(rank_one_based)
+        rank_display = rank_displays[rank_one_based]
         scores_with_discard = [
             (s if s is not None else None, is_discarded[i], rc_displays[i] if i < len(rc_displays) else None)
             for i, s in enumerate(race_scores)
@@ -221,6 +341,35 @@ def _rank_display(rank: int) -> str:
     return f"{rank}th"
 
 
+def _format_score_cell(score: float | None, is_discarded: bool, rc_display: str | None) -> str:
+    """One race cell: score with optional rc_scoring/DNC code; discarded scores in parentheses."""
+    if score is None:
+        return ""
+    cell = f"{score:.1f} {rc_display}" if rc_display else f"{score:.1f}"
+    return f"({cell})" if is_discarded else cell
+
+
+def _iter_csv_rows(rows: list[dict[str, Any]], race_ids: list[str]) -> Iterator[list[Any]]:
+    """Yield the header and then one list of cells per result row."""
+    yield ["RANK", "Sail Number", "Name"] + [f"R{r}" for r in race_ids] + ["TOTAL", "NET"]
+    # Cells repeat heavily (positions 1..n, one penalty score), so each distinct
+    # (score, is_discarded, rc_display) is formatted once per CSV
+    cells: dict[tuple[Any, ...], str] = {}
+    cells_get = cells.get
+    for row in rows:
+        score_cells = []
+        for key in map(tuple, row["scores"]):
+            cell = cells_get(key)
+            if cell is None:
+                cell = cells[key] = _format_score_cell(*key)
+            score_cells.append(cell)
+        yield (
+            [row["rank_display"], row["sail_number"], row.get("name", "")]
+            + score_cells
+            + [f"{row['total']:.1f}", f"{row['net']:.1f}"]
+        )
+
+
 def write_result_csv(
     rows: list[dict[str, Any]],
     race_ids: list[str],
@@ -231,58 +380,44 @@ def write_result_csv(
     Discarded scores are shown in parentheses e.g. (3.0).
     """
     path = Path(path)
-    header = ["RANK", "Sail Number", "Name"] + [f"R{r}" for r in race_ids] + ["TOTAL", "NET"]
-
     with path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        for row in rows:
-            rank_display = row["rank_display"]
-            sail_number = row["sail_number"]
-            name = row.get("name", "")
-            score_cells = []
-            for score, is_discarded, rc_display in row["scores"]:
-                if score is None:
-                    score_cells.append("")
-                else:
-                    cell = f"{score:.1f}" + (f" {rc_display}" if rc_display else "")
-                    if is_discarded:
-                        cell = f"({cell})" if not rc_display else f"({score:.1f} {rc_display})"
-                    score_cells.append(cell)
-            total = row["total"]
-            net = row["net"]
-            writer.writerow([rank_display, sail_number, name] + score_cells + [f"{total:.1f}", f"{net:.1f}"])
+        csv.writer(f).writerows(_iter_csv_rows(rows, race_ids))
+
+
+def iter_csv_lines(rows: list[dict[str, Any]], race_ids: list[str]) -> Iterator[str]:
+    """Yield the CSV one line at a time (header first), for streaming responses."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for cells in _iter_csv_rows(rows, race_ids):
+        writer.writerow(cells)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
 
 
 def to_csv_string(rows: list[dict[str, Any]], race_ids: list[str]) -> str:
     """Return CSV content as a string (for testing)."""
-    import io
     buf = io.StringIO()
-    header = ["RANK", "Sail Number", "Name"] + [f"R{r}" for r in race_ids] + ["TOTAL", "NET"]
-    writer = csv.writer(buf)
-    writer.writerow(header)
-    for row in rows:
-        rank_display = row["rank_display"]
-        sail_number = row["sail_number"]
-        name = row.get("name", "")
-        score_cells = []
-        for score, is_discarded, rc_display in row["scores"]:
-            if score is None:
-                score_cells.append("")
-            else:
-                cell = f"{score:.1f}" + (f" {rc_display}" if rc_display else "")
-                if is_discarded:
-                    cell = f"({cell})" if not rc_display else f"({score:.1f} {rc_display})"
-                score_cells.append(cell)
-        total = row["total"]
-        net = row["net"]
-        writer.writerow([rank_display, sail_number, name] + score_cells + [f"{total:.1f}", f"{net:.1f}"])
+    csv.writer(buf).writerows(_iter_csv_rows(rows, race_ids))
     return buf.getvalue()
 
 
 # ---------- Result CSV generation (uses DataAccess for MongoDB) ----------
 
 
+def load_race_positions(
+    race_ids: list[str],
+) -> tuple[dict[str, list[float | None]], list[tuple[str, str, str]]]:
+    """
+    positions_from_finishes output with the per-race ranking done by MongoDB (load_positions);
+    only the rc_scoring finishes are transferred as documents.
+    """
+    ranked, rc_finishes = run_concurrently(
+        lambda: load_positions(race_ids), lambda: load_rc_scoring_finishes(race_ids)
+    )
+    return positions_from_ranked(ranked, rc_finishes, race_ids)
+
+
 def generate_result_csv_for_event(
     event_id: str,
     *,
@@ -292,17 +427,15 @@ def generate_result_csv_for_event(
     Load event, entries, races, and finishes from MongoDB (Scoring database),
     compute series result, write CSV, return rows.
     """
-    events = load_event_info()
-    event_info = next((e for e in events if str(e.get("_id")) == str(event_id)), None)
+    event_info = load_event_by_id(event_id, projection=EVENT_SCORING_FIELDS)
     if not event_info:
         raise ValueError(f"Event {event_id} not found in event info")
 
-    entries = load_entries()
-    races_list = load_race_info()
-    races = [r for r in races_list if str(r.get("event_id")) == str(event_id)]
-    finishes = load_finishes()
-
-    rows = build_series_result(event_id, entries, races, finishes, event_info)
+    entries = load_entries(event_id, projection=ENTRY_SCORING_FIELDS)
+    races = load_race_info(event_id, projection=RACE_SCORING_FIELDS)
     race_ids = [r["race_id"] for r in races]
+    positions = load_race_positions(race_ids)
+
+    rows = build_series_result(event_id, entries, races, [], event_info, positions=positions)
     write_result_csv(rows, race_ids, output_csv_path)
     return rows
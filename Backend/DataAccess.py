@@ -4,15 +4,66 @@ Loads MONGO_URI from .env via python-dotenv; provides get_db() and load_* functi
 """
 from __future__ import annotations
 
+import contextlib
+import contextvars
+import functools
+import logging
 import os
-from typing import Any
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
 
 import certifi
+from bson import ObjectId
 from dotenv import load_dotenv
 from pymongo import MongoClient
 from pymongo.database import Database
+from pymongo.errors import OperationFailure, PyMongoError
 
+_log = logging.getLogger(__name__)
 _DB: Database[dict[str, Any]] | None = None
+MONGO_MAX_POOL_SIZE = 50  # connections per process; covers concurrent requests plus run_concurrently
+_INDEXES_READY = False
+# True once the unique sail number index is known to exist (set by _create_indexes)
+_SAIL_INDEX_UNIQUE = False
+
+# Short-lived read cache for load_* results: (collections, function, args) -> (expires_at, payload).
+# Writes through ScoringEntry call invalidate(); other processes (gunicorn workers, instances)
+# see changes only after the TTL. 0 (CACHE_TTL_SECONDS in the environment) disables caching.
+CACHE_TTL_SECONDS = float(os.environ.get("CACHE_TTL_SECONDS", "5"))
+# Keys come from request arguments, so the cache is bounded: when full, expired entries are
+# dropped first, then the oldest
+CACHE_MAX_ENTRIES = 1024
+_cache: dict[tuple[Any, ...], tuple[float, Any]] = {}
+_cache_lock = threading.Lock()
+# Set inside fresh_reads(): load_* calls skip cached entries
+_fresh_reads: contextvars.ContextVar[bool] = contextvars.ContextVar("fresh_reads", default=False)
+# Bumped by every invalidate(); callers caching derived data (e.g. results) include it in their keys
+_data_version = 0
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+# Unique sail number per event, for entries that have sail_number_normalized
+SAIL_INDEX_KEY = [("event_id", 1), ("sail_number_normalized", 1)]
+SAIL_INDEX_OPTIONS: dict[str, Any] = {
+    "unique": True,
+    "partialFilterExpression": {"sail_number_normalized": {"$exists": True}},
+}
+
+# Shared pool for independent MongoDB round trips (PyMongo releases the GIL on socket I/O).
+# Sized like the connection pool, so concurrent requests' fan-out reads do not queue behind a few
+# workers; created at import (threads start on first submit, so nothing runs before a fork).
+_POOL = ThreadPoolExecutor(max_workers=MONGO_MAX_POOL_SIZE, thread_name_prefix="mongo")
+
+# Projections with only the fields build_series_result reads (no _id or audit fields)
+EVENT_SCORING_FIELDS: dict[str, Any] = {"discard": 1}
+ENTRY_SCORING_FIELDS: dict[str, Any] = {"_id": 0, "event_id": 1, "sail_number": 1, "name": 1}
+RACE_SCORING_FIELDS: dict[str, Any] = {"_id": 0, "event_id": 1, "race_id": 1, "start_time": 1}
+FINISH_SCORING_FIELDS: dict[str, Any] = {
+    "_id": 0, "sail_number": 1, "race_id": 1, "finish_time": 1, "rc_scoring": 1,
+}
 
 
 def get_db() -> Database[dict[str, Any]]:
@@ -23,33 +74,283 @@ def get_db() -> Database[dict[str, Any]]:
         uri = os.environ.get("MONGO_URI")
         if not uri:
             raise ValueError("MONGO_URI is not set; add it to .env or the environment")
-        # Use certifi CA bundle so SSL works on macOS (avoids CERTIFICATE_VERIFY_FAILED)
-        client = MongoClient(uri, tlsCAFile=certifi.where())
+        # Use certifi CA bundle so SSL works on macOS (avoids CERTIFICATE_VERIFY_FAILED).
+        # One pooled client per process; connect=False defers the handshake to the first
+        # operation so a client created before a (gunicorn) fork is not shared across workers.
+        client = MongoClient(uri, tlsCAFile=certifi.where(), maxPoolSize=MONGO_MAX_POOL_SIZE, connect=False)
         _DB = client["Scoring"]
+    if not _INDEXES_READY:
+        _ensure_indexes(_DB)
     return _DB
 
 
-def load_event_info() -> list[dict[str, Any]]:
+def _ensure_indexes(db: Database[dict[str, Any]]) -> None:
+    """
+    Create the indexes used by the load_* queries (idempotent; runs once per process). Errors are
+    logged, not raised; after a connection error the next get_db() tries again.
+    """
+    global _INDEXES_READY
+    try:
+        _create_indexes(db)
+    except OperationFailure as e:
+        # Rejected by the server (e.g. no createIndex privilege): retrying would fail the same way
+        _log.warning("Could not create MongoDB indexes: %s", e)
+    except PyMongoError as e:
+        _log.warning("Could not create MongoDB indexes (retrying on next use): %s", e)
+        return
+    _INDEXES_READY = True
+
+
+def _create_indexes(db: Database[dict[str, Any]]) -> None:
+    """create_index for every index; each call is a no-op if the index already exists."""
+    global _SAIL_INDEX_UNIQUE
+    # Per-race finish order, used by load_positions' window sort; its race_id prefix also serves
+    # load_finishes(race_ids), load_rc_scoring_finishes, the $lookup and the race cascade deletes
+    db.ScoreSample.create_index([("race_id", 1), ("finish_time", 1)])
+    # delete_division's $pull matches division_ids without an event_id
+    db.Entry.create_index([("division_ids", 1)])
+    # Duplicate sail numbers per event are rejected by the server (ScoringEntry.insert_entry);
+    # entries without sail_number_normalized (not yet backfilled) are outside the index
+    try:
+        db.Entry.create_index(SAIL_INDEX_KEY, **SAIL_INDEX_OPTIONS)
+        _SAIL_INDEX_UNIQUE = True
+    except OperationFailure as e:
+        # An earlier non-unique index of the same name, or existing duplicates: keep the lookup
+        # indexed; scripts/backfill_sail_number_normalized.py converts it once they are cleaned up
+        _log.warning("Entry sail number index is not unique: %s", e)
+        db.Entry.create_index(SAIL_INDEX_KEY)
+    db.Division.create_index([("event_id", 1)])
+    # Multikey index for load_entries(event_id, division_id=...); its event_id prefix also serves
+    # load_entries(event_id), delete_event and the legacy branch of the sail number check
+    db.Entry.create_index([("event_id", 1), ("division_ids", 1)])
+    # Filter + sort for load_race_info(event_id)
+    db.RaceInfo.create_index([("event_id", 1), ("start_time", 1), ("race_id", 1)])
+    # Covers the $match + $group on race_id in load_finishes_for_event
+    db.RaceInfo.create_index([("event_id", 1), ("race_id", 1)])
+
+
+def sail_index_is_unique() -> bool:
+    """True if the server enforces unique sail numbers per event (see _create_indexes)."""
+    get_db()
+    return _SAIL_INDEX_UNIQUE
+
+
+def run_concurrently(*calls: Callable[[], Any]) -> list[Any]:
+    """Run independent zero-argument calls on the shared thread pool; return their results in order."""
+    if len(calls) <= 1:
+        return [call() for call in calls]
+    # Each call runs in a copy of the caller's context, so fresh_reads() applies inside the pool
+    futures = [_POOL.submit(contextvars.copy_context().run, call) for call in calls]
+    # result() re-raises the first failure after every call has been submitted
+    return [f.result() for f in futures]
+
+
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+def is_oid(raw_id: str) -> bool:
+    """
+    True if raw_id parses as an ObjectId (24 hex chars), checked without raising/catching InvalidId.
+    Entry, division, race and finish ids always are; event ids may not be.
+    """
+    return len(raw_id) == 24 and _HEX_DIGITS.issuperset(raw_id)
+
+
+def id_match(raw_id: Any) -> dict[str, Any]:
+    """_id filter matching either the ObjectId or the raw string form, so one query covers both."""
+    raw_id = str(raw_id)
+    if is_oid(raw_id):
+        return {"_id": {"$in": [ObjectId(raw_id), raw_id]}}
+    return {"_id": raw_id}
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of a load_* argument (projection dicts, race_id lists)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _cached(*collections: str, ttl: float = CACHE_TTL_SECONDS) -> Callable[[_F], _F]:
+    """
+    Cache a load_* function's result per arguments for ttl seconds. collections are the ones the
+    result is read from; invalidating any of them drops the entry.
+    """
+
+    def decorator(fn: _F) -> _F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = (collections, fn.__name__, _freeze(args), _freeze(kwargs))
+            hit = _cache.get(key)
+            now = time.monotonic()
+            if hit is not None and now < hit[0] and not _fresh_reads.get():
+                payload = hit[1]
+            else:
+                # Read before the query: a write that lands while it runs must not be cached over
+                version = _data_version
+                payload = fn(*args, **kwargs)
+                _store(key, now + ttl, payload, version)
+            # New list each call; the documents themselves are shared and must not be mutated
+            return list(payload) if isinstance(payload, list) else payload
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _store(key: tuple[Any, ...], expires_at: float, payload: Any, version: int) -> None:
+    """
+    Add a cache entry, evicting expired entries and then the oldest ones if the cache is full.
+    Skipped if an invalidate() ran since version was read, as payload may predate that write.
+    """
+    with _cache_lock:
+        if version != _data_version:
+            return
+        # Re-inserted at the end, so iteration order stays oldest first
+        _cache.pop(key, None)
+        if len(_cache) >= CACHE_MAX_ENTRIES:
+            now = time.monotonic()
+            for k in [k for k, (exp, _) in _cache.items() if exp <= now]:
+                del _cache[k]
+            while len(_cache) >= CACHE_MAX_ENTRIES:
+                del _cache[next(iter(_cache))]
+        _cache[key] = (expires_at, payload)
+
+
+def invalidate(*collections: str) -> None:
+    """Drop cached load_* results for the given collections (all collections if none given)."""
+    global _data_version
+    with _cache_lock:
+        _data_version += 1
+        if not collections:
+            _cache.clear()
+            return
+        collections_set = set(collections)
+        for key in [k for k in _cache if not collections_set.isdisjoint(k[0])]:
+            del _cache[key]
+
+
+@contextlib.contextmanager
+def fresh_reads() -> Iterator[None]:
+    """
+    Within the block, load_* calls (including those made through run_concurrently) query MongoDB
+    instead of using cached entries; their results still refresh the cache. For callers that cache
+    derived data themselves and must not stack their TTL on top of the load_* one.
+    """
+    token = _fresh_reads.set(True)
+    try:
+        yield
+    finally:
+        _fresh_reads.reset(token)
+
+
+def data_version() -> int:
+    """Counter that changes on every write made through ScoringEntry (see invalidate)."""
+    return _data_version
+
+
+@_cached("EventInfo")
+def load_event_info(projection: dict[str, Any] | None = None) -> list[dict[str, Any]]:
     """Load all events from Scoring.EventInfo."""
-    return list(get_db().EventInfo.find({}))
+    return list(get_db().EventInfo.find({}, projection))
+
 
+@_cached("EventInfo")
+def load_event_by_id(
+    event_id: str,
+    projection: dict[str, Any] | None = None,
+) -> dict[str, Any] | None:
+    """Load one event by _id (an ObjectId or a plain string id), or None if there is none."""
+    return get_db().EventInfo.find_one(id_match(event_id), projection)
 
-def load_entries() -> list[dict[str, Any]]:
-    """Load all entries from Scoring.Entry."""
-    return list(get_db().Entry.find({}))
 
+@_cached("Entry")
+def load_entries(
+    event_id: str | None = None,
+    projection: dict[str, Any] | None = None,
+    division_id: str | None = None,
+) -> list[dict[str, Any]]:
+    """Load entries from Scoring.Entry, optionally only those of one event and/or division (filtered server-side)."""
+    query: dict[str, Any] = {"event_id": str(event_id)} if event_id is not None else {}
+    if division_id is not None:
+        # Array containment: entries whose division_ids include division_id
+        query["division_ids"] = str(division_id)
+    return list(get_db().Entry.find(query, projection))
 
-def load_race_info() -> list[dict[str, Any]]:
-    """Load all races from Scoring.RaceInfo (sorted by start_time then race_id for order)."""
+
+@_cached("RaceInfo")
+def load_race_info(
+    event_id: str | None = None,
+    projection: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Load races from Scoring.RaceInfo (sorted by start_time then race_id for order), optionally for one event."""
     coll = get_db().RaceInfo
-    return list(coll.find({}).sort([("start_time", 1), ("race_id", 1)]))
+    query = {"event_id": str(event_id)} if event_id is not None else {}
+    return list(coll.find(query, projection).sort([("start_time", 1), ("race_id", 1)]))
+
+
+@_cached("ScoreSample")
+def load_finishes(
+    race_ids: list[str] | None = None,
+    projection: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Load finish records from Scoring.ScoreSample, optionally only those of the given races (filtered server-side)."""
+    query = {"race_id": {"$in": [str(r) for r in race_ids]}} if race_ids is not None else {}
+    return list(get_db().ScoreSample.find(query, projection))
+
+
+@_cached("RaceInfo", "ScoreSample")
+def load_finishes_for_event(event_id: str, race_id: str | None = None) -> list[dict[str, Any]]:
+    """
+    Load the finishes of one event's races (optionally only race_id, if it belongs to the event)
+    in a single RaceInfo -> ScoreSample $lookup aggregation.
+    """
+    match: dict[str, Any] = {"event_id": str(event_id)}
+    if race_id is not None:
+        match["race_id"] = str(race_id)
+    pipeline: list[dict[str, Any]] = [
+        {"$match": match},
+        # One lookup per distinct race_id, so a race listed twice does not duplicate its finishes
+        {"$group": {"_id": "$race_id"}},
+        {"$lookup": {"from": "ScoreSample", "localField": "_id", "foreignField": "race_id", "as": "f"}},
+        {"$unwind": "$f"},
+        {"$replaceRoot": {"newRoot": "$f"}},
+    ]
+    return list(get_db().RaceInfo.aggregate(pipeline))
+
+
+@_cached("ScoreSample")
+def load_positions(race_ids: list[str]) -> list[dict[str, Any]]:
+    """
+    Per-race finishing positions computed server-side (requires MongoDB 5.0+ for $setWindowFields).
+    Finishes without rc_scoring are numbered 1, 2, 3, ... per race by finish_time (ties keep
+    insertion order via _id). Returns [{"sail_number", "race_id", "position"}, ...].
+    """
+    pipeline: list[dict[str, Any]] = [
+        {"$match": {"race_id": {"$in": list(race_ids)}, "rc_scoring": {"$in": [None, ""]}}},
+        {
+            "$setWindowFields": {
+                "partitionBy": "$race_id",
+                "sortBy": {"finish_time": 1, "_id": 1},
+                "output": {"position": {"$documentNumber": {}}},
+            }
+        },
+        {"$project": {"_id": 0, "sail_number": 1, "race_id": 1, "position": 1}},
+    ]
+    return list(get_db().ScoreSample.aggregate(pipeline))
 
 
-def load_finishes() -> list[dict[str, Any]]:
-    """Load all finish records from Scoring.ScoreSample."""
-    return list(get_db().ScoreSample.find({}))
+@_cached("ScoreSample")
+def load_rc_scoring_finishes(race_ids: list[str]) -> list[dict[str, Any]]:
+    """Load finishes with an rc_scoring code (OCS, DNF, ...) for the given races."""
+    query = {"race_id": {"$in": list(race_ids)}, "rc_scoring": {"$nin": [None, ""]}}
+    return list(get_db().ScoreSample.find(query, FINISH_SCORING_FIELDS))
 
 
-def load_divisions() -> list[dict[str, Any]]:
-    """Load all divisions from Scoring.Division."""
-    return list(get_db().Division.find({}))
+@_cached("Division")
+def load_divisions(event_id: str | None = None) -> list[dict[str, Any]]:
+    """Load divisions from Scoring.Division, optionally only those of one event (filtered server-side)."""
+    query = {"event_id": str(event_id)} if event_id is not None else {}
+    return list(get_db().Division.find(query))
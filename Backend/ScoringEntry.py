@@ -4,24 +4,88 @@ Also provides document builders and MongoDB insert helpers for EventInfo, Entry,
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any
+import functools
+from array import array
+from operator import itemgetter
+from typing import Any, NamedTuple
 
 from bson import ObjectId
-from pymongo import ReturnDocument
-from DataAccess import get_db
+from pymongo import InsertOne, ReturnDocument, WriteConcern
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
+from DataAccess import get_db, id_match, invalidate, is_oid, run_concurrently, sail_index_is_unique
+
+
+# ---------- Collection handles ----------
+# get_db() is a process-wide singleton (one MongoClient); the collection objects are
+# resolved once here instead of on every call.
+
+
+@functools.lru_cache(maxsize=1)
+def _events() -> Collection[dict[str, Any]]:
+    return get_db().EventInfo
+
+
+@functools.lru_cache(maxsize=1)
+def _entries() -> Collection[dict[str, Any]]:
+    return get_db().Entry
+
+
+@functools.lru_cache(maxsize=1)
+def _divisions() -> Collection[dict[str, Any]]:
+    return get_db().Division
+
+
+@functools.lru_cache(maxsize=1)
+def _races() -> Collection[dict[str, Any]]:
+    return get_db().RaceInfo
+
+
+@functools.lru_cache(maxsize=1)
+def _finishes() -> Collection[dict[str, Any]]:
+    return get_db().ScoreSample
+
+
+def _coerce_id(raw_id: Any) -> ObjectId | str:
+    """ObjectId for a 24-hex-char id, otherwise the id string unchanged."""
+    raw_id = str(raw_id)
+    return ObjectId(raw_id) if is_oid(raw_id) else raw_id
 
 
 # ---------- Document builders (for data entry) ----------
 
 
+def _req_str(value: Any, field: str) -> str:
+    """Return str(value) stripped once; raise ValueError if that leaves nothing."""
+    cleaned = str(value).strip() if value else ""
+    if not cleaned:
+        raise ValueError(f"{field} must be non-empty")
+    return cleaned
+
+
+@functools.lru_cache(maxsize=128)
+def _event_id(event_id: str) -> str:
+    """_req_str for event_id, memoized: bulk builds repeat the same few event ids."""
+    return _req_str(event_id, "event_id")
+
+
+def _discard_list(discard: Any) -> list[int]:
+    """Copy of a discard list, checked to hold only ints; raises ValueError otherwise."""
+    if not isinstance(discard, list):
+        raise ValueError("discard must be a list of integers")
+    try:
+        # array('i') type-checks every item in C (TypeError for non-ints, OverflowError for huge ints)
+        return list(array("i", discard))
+    except (TypeError, OverflowError):
+        raise ValueError("discard must be a list of integers") from None
+
+
 def event_doc(discard: list[int], name: str = "") -> dict[str, Any]:
     """Build an EventInfo document: {"discard": discard, "name": name}. _id is omitted so MongoDB auto-generates it."""
-    if not isinstance(discard, list) or not all(isinstance(x, int) for x in discard):
-        raise ValueError("discard must be a list of integers")
-    doc: dict[str, Any] = {"discard": list(discard)}
-    if name is not None and str(name).strip():
-        doc["name"] = str(name).strip()
+    doc: dict[str, Any] = {"discard": _discard_list(discard)}
+    name = str(name).strip() if name is not None else ""
+    if name:
+        doc["name"] = name
     return doc
 
 
@@ -31,45 +95,40 @@ def entry_doc(
     name: str = "",
     division_ids: list[str] | None = None,
 ) -> dict[str, Any]:
-    """Build an Entry document: {"event_id", "sail_number", "name", "division_ids"?}."""
-    if not event_id or not event_id.strip():
-        raise ValueError("event_id must be non-empty")
-    if not sail_number or not str(sail_number).strip():
-        raise ValueError("sail_number must be non-empty")
+    """Build an Entry document: {"event_id", "sail_number", "sail_number_normalized", "name", "division_ids"?}."""
+    event_id = _event_id(event_id)
+    sail_number = _req_str(sail_number, "sail_number")
     doc: dict[str, Any] = {
-        "event_id": event_id.strip(),
-        "sail_number": str(sail_number).strip(),
+        "event_id": event_id,
+        "sail_number": sail_number,
+        # Indexed with event_id for the duplicate sail number check
+        "sail_number_normalized": _normalize_sail(sail_number),
         "name": (name or "").strip(),
     }
     if division_ids is not None:
-        doc["division_ids"] = [str(d).strip() for d in division_ids if str(d).strip()]
+        stripped = (str(d).strip() for d in division_ids)
+        doc["division_ids"] = [d for d in stripped if d]
     return doc
 
 
 def division_doc(event_id: str, name: str) -> dict[str, Any]:
     """Build a Division document: {"event_id", "name"}."""
-    if not event_id or not event_id.strip():
-        raise ValueError("event_id must be non-empty")
-    if not name or not str(name).strip():
-        raise ValueError("name must be non-empty")
+    event_id = _event_id(event_id)
+    name = _req_str(name, "name")
     return {
-        "event_id": event_id.strip(),
-        "name": str(name).strip(),
+        "event_id": event_id,
+        "name": name,
     }
 
 
 def race_doc(event_id: str, race_id: str, start_time: str) -> dict[str, Any]:
     """Build a RaceInfo document: {"event_id", "race_id", "start_time"}."""
-    if not event_id or not event_id.strip():
-        raise ValueError("event_id must be non-empty")
-    if not race_id or not str(race_id).strip():
-        raise ValueError("race_id must be non-empty")
-    if not start_time or not str(start_time).strip():
-        raise ValueError("start_time must be non-empty")
+    event_id = _event_id(event_id)
+    race_id, start_time = map(_req_str, (race_id, start_time), ("race_id", "start_time"))
     return {
-        "event_id": event_id.strip(),
-        "race_id": str(race_id).strip(),
-        "start_time": str(start_time).strip(),
+        "event_id": event_id,
+        "race_id": race_id,
+        "start_time": start_time,
     }
 
 
@@ -80,19 +139,17 @@ def finish_doc(
     rc_scoring: str | None = None,
 ) -> dict[str, Any]:
     """Build a ScoreSample (finish) document: {"sail_number", "race_id", "finish_time", "rc_scoring"?}."""
-    if not sail_number or not str(sail_number).strip():
-        raise ValueError("sail_number must be non-empty")
-    if not race_id or not str(race_id).strip():
-        raise ValueError("race_id must be non-empty")
-    if not finish_time or not str(finish_time).strip():
-        raise ValueError("finish_time must be non-empty")
+    sail_number, race_id, finish_time = map(
+        _req_str, (sail_number, race_id, finish_time), ("sail_number", "race_id", "finish_time")
+    )
     doc: dict[str, Any] = {
-        "sail_number": str(sail_number).strip(),
-        "race_id": str(race_id).strip(),
-        "finish_time": str(finish_time).strip(),
+        "sail_number": sail_number,
+        "race_id": race_id,
+        "finish_time": finish_time,
     }
-    if rc_scoring is not None and str(rc_scoring).strip():
-        doc["rc_scoring"] = str(rc_scoring).strip()
+    rc_scoring = str(rc_scoring).strip() if rc_scoring is not None else ""
+    if rc_scoring:
+        doc["rc_scoring"] = rc_scoring
     return doc
 
 
@@ -101,32 +158,23 @@ def finish_doc(
 
 def insert_event(doc: dict[str, Any]) -> Any:
     """Insert one event into Scoring.EventInfo. Returns inserted _id."""
-    return get_db().EventInfo.insert_one(doc)
+    result = _events().insert_one(doc)
+    invalidate("EventInfo")
+    return result
 
 
 def update_event(
     event_id: str, discard: list[int], name: str | None = None
 ) -> dict[str, Any] | None:
     """Update an event's discard list and optionally name in Scoring.EventInfo. Returns updated document or None if not found."""
-    if not isinstance(discard, list) or not all(isinstance(x, int) for x in discard):
-        raise ValueError("discard must be a list of integers")
-    coll = get_db().EventInfo
-    try:
-        q = {"_id": ObjectId(event_id)}
-    except Exception:
-        q = {"_id": event_id}
-    update_fields: dict[str, Any] = {"discard": list(discard)}
+    update_fields: dict[str, Any] = {"discard": _discard_list(discard)}
+    coll = _events()
+    q = id_match(event_id)
     if name is not None:
         update_fields["name"] = (name or "").strip()
     update = {"$set": update_fields}
     result = coll.find_one_and_update(q, update, return_document=ReturnDocument.AFTER)
-    if result is None:
-        # Retry with the other _id type (string vs ObjectId)
-        try:
-            q = {"_id": event_id}
-            result = coll.find_one_and_update(q, update, return_document=ReturnDocument.AFTER)
-        except Exception:
-            pass
+    invalidate("EventInfo")
     return result
 
 
@@ -135,37 +183,37 @@ def delete_event(event_id: str) -> bool:
     if not event_id or not str(event_id).strip():
         raise ValueError("event_id must be non-empty")
     event_id_str = str(event_id).strip()
-    db = get_db()
-    # Resolve event _id for EventInfo (may be ObjectId or string)
-    try:
-        event_oid = ObjectId(event_id_str)
-        event_query = {"_id": event_oid}
-    except Exception:
-        event_oid = None
-        event_query = {"_id": event_id_str}
-    event_doc = db.EventInfo.find_one(event_query)
-    if not event_doc:
+    # Event _ids may be ObjectIds or plain strings: same match as load_event_by_id/update_event
+    existing = _events().find_one(id_match(event_id_str), projection={"_id": 1})
+    if not existing:
         return False
-    # Delete all entries for this event
-    db.Entry.delete_many({"event_id": event_id_str})
-    # Delete all divisions for this event
-    db.Division.delete_many({"event_id": event_id_str})
-    # Delete all finishes for races of this event, then delete the races
-    races = list(db.RaceInfo.find({"event_id": event_id_str}))
-    for race in races:
-        race_id_str = str(race.get("race_id", ""))
-        if race_id_str:
-            db.ScoreSample.delete_many({"race_id": race_id_str})
-    db.RaceInfo.delete_many({"event_id": event_id_str})
+    race_ids = [
+        str(race["race_id"])
+        for race in _races().find({"event_id": event_id_str}, {"race_id": 1, "_id": 0})
+        if race.get("race_id")
+    ]
+    # Entries, divisions, finishes (one $in delete) and races are independent: delete them concurrently
+    deletes = [
+        lambda: _entries().delete_many({"event_id": event_id_str}),
+        lambda: _divisions().delete_many({"event_id": event_id_str}),
+        lambda: _races().delete_many({"event_id": event_id_str}),
+    ]
+    if race_ids:
+        deletes.append(lambda: _finishes().delete_many({"race_id": {"$in": race_ids}}))
+    run_concurrently(*deletes)
     # Delete the event
-    result = db.EventInfo.delete_one(event_query)
+    result = _events().delete_one({"_id": existing["_id"]})
+    invalidate("EventInfo", "Entry", "Division", "RaceInfo", "ScoreSample")
     return result.deleted_count > 0
 
 
+# Deletes every character str.split() treats as whitespace (all are below U+3001)
+_WS_TABLE = dict.fromkeys(c for c in range(0x3001) if chr(c).isspace())
+
+
 def _normalize_sail(s: str) -> str:
-    """Normalize sail number for duplicate comparison: strip, remove all whitespace, lower."""
-    t = (s or "").strip().lower()
-    return "".join(t.split())
+    """Normalize sail number for duplicate comparison: remove all whitespace, lower."""
+    return (s or "").lower().translate(_WS_TABLE)
 
 
 def entry_with_sail_number_exists(
@@ -174,43 +222,83 @@ def entry_with_sail_number_exists(
     """Return True if an entry for this event already has this sail number (normalized). Optionally exclude an entry by _id (for updates)."""
     if not sail_number or not str(sail_number).strip():
         return False
-    coll = get_db().Entry
     norm = _normalize_sail(sail_number)
-    event_id_str = str(event_id).strip()
-    for doc in coll.find({"event_id": event_id_str}):
-        if exclude_entry_id and str(doc.get("_id")) == str(exclude_entry_id):
-            continue
-        if _normalize_sail(doc.get("sail_number")) == norm:
-            return True
-    return False
+    query: dict[str, Any] = {"event_id": str(event_id).strip()}
+    if exclude_entry_id:
+        exclude_id = str(exclude_entry_id)
+        if is_oid(exclude_id):
+            query["_id"] = {"$nin": [ObjectId(exclude_id), exclude_id]}
+        else:
+            query["_id"] = {"$ne": exclude_id}
+    # One round trip: backfilled entries match on the indexed sail_number_normalized; entries
+    # written before that field existed (until the backfill script has run) are normalized on the
+    # server. Returns at most one _id.
+    matches = _entries().aggregate([
+        {"$match": {**query, "$or": [
+            {"sail_number_normalized": norm},
+            {"sail_number_normalized": {"$exists": False}},
+        ]}},
+        {"$project": {"norm": {"$ifNull": ["$sail_number_normalized", {"$toLower": {"$replaceAll": {
+            "input": {"$trim": {"input": {"$toString": "$sail_number"}}},
+            "find": " ",
+            "replacement": "",
+        }}}]}}},
+        {"$match": {"norm": norm}},
+        {"$limit": 1},
+        {"$project": {"_id": 1}},
+    ])
+    return next(matches, None) is not None
+
+
+@functools.lru_cache(maxsize=1)
+def _legacy_sail_events() -> frozenset[str]:
+    """
+    event_ids that have entries without sail_number_normalized, read once per process. Nothing
+    writes such entries any more, so the set can only shrink (backfill): a stale one just means
+    an extra precheck.
+    """
+    return frozenset(
+        str(e) for e in _entries().distinct("event_id", {"sail_number_normalized": {"$exists": False}})
+    )
+
+
+def sail_precheck_needed(event_id: str | None = None) -> bool:
+    """
+    True if entry_with_sail_number_exists has to run before an insert or sail number update in
+    this event (any event if event_id is None): the unique index is missing, or the event still
+    has entries the index does not cover. Otherwise insert_entry/update_entry reject duplicates.
+    """
+    if not sail_index_is_unique():
+        return True
+    legacy = _legacy_sail_events()
+    return bool(legacy) if event_id is None else str(event_id).strip() in legacy
 
 
 def get_entry(entry_id: str) -> dict[str, Any] | None:
     """Get one entry by _id. Returns the document or None if not found."""
-    coll = get_db().Entry
-    try:
-        return coll.find_one({"_id": ObjectId(entry_id)})
-    except Exception:
-        return coll.find_one({"_id": entry_id})
+    return _entries().find_one({"_id": _coerce_id(entry_id)})
 
 
 def insert_entry(doc: dict[str, Any]) -> Any:
-    """Insert one entry into Scoring.Entry. Returns inserted _id."""
-    return get_db().Entry.insert_one(doc)
+    """Insert one entry into Scoring.Entry. Returns inserted _id. Raises ValueError if the sail number is already in the event."""
+    try:
+        result = _entries().insert_one(doc)
+    except DuplicateKeyError:
+        raise ValueError("Duplicate sail number") from None
+    invalidate("Entry")
+    return result
 
 
 def update_entry(entry_id: str, data: dict[str, Any]) -> dict[str, Any] | None:
-    """Update an entry by _id. data may contain "sail_number", "name", "division_ids". Returns updated document or None if not found."""
-    coll = get_db().Entry
-    try:
-        q = {"_id": ObjectId(entry_id)}
-    except Exception:
-        q = {"_id": entry_id}
+    """Update an entry by _id. data may contain "sail_number", "name", "division_ids". Returns updated document or None if not found. Raises ValueError on a duplicate sail number."""
+    coll = _entries()
+    q = {"_id": _coerce_id(entry_id)}
     updates: dict[str, Any] = {}
     if "sail_number" in data:
         sn = (data.get("sail_number") or "").strip()
         if sn:
             updates["sail_number"] = sn
+            updates["sail_number_normalized"] = _normalize_sail(sn)
     if "name" in data:
         updates["name"] = (data.get("name") or "").strip()
     if "division_ids" in data:
@@ -222,154 +310,223 @@ def update_entry(entry_id: str, data: dict[str, Any]) -> dict[str, Any] | None:
     if not updates:
         result = coll.find_one(q)
         return result
-    result = coll.find_one_and_update(q, {"$set": updates}, return_document=ReturnDocument.AFTER)
-    if result is None and "_id" in q and not isinstance(q["_id"], ObjectId):
-        result = coll.find_one_and_update(
-            {"_id": ObjectId(entry_id)}, {"$set": updates}, return_document=ReturnDocument.AFTER
-        )
+    try:
+        result = coll.find_one_and_update(q, {"$set": updates}, return_document=ReturnDocument.AFTER)
+    except DuplicateKeyError:
+        raise ValueError("Duplicate sail number") from None
+    invalidate("Entry")
     return result
 
 
 def delete_entry(entry_id: str) -> bool:
     """Delete one entry from Scoring.Entry by _id. Returns True if a document was deleted."""
-    try:
-        result = get_db().Entry.delete_one({"_id": ObjectId(entry_id)})
-        return result.deleted_count > 0
-    except Exception:
+    if not is_oid(str(entry_id)):
         return False
+    result = _entries().delete_one({"_id": ObjectId(entry_id)})
+    invalidate("Entry")
+    return result.deleted_count > 0
 
 
 def insert_division(doc: dict[str, Any]) -> Any:
     """Insert one division into Scoring.Division. Returns inserted _id."""
-    return get_db().Division.insert_one(doc)
+    result = _divisions().insert_one(doc)
+    invalidate("Division")
+    return result
 
 
 def update_division(division_id: str, name: str) -> dict[str, Any] | None:
     """Update a division's name in Scoring.Division. Returns updated document or None if not found."""
     if not name or not str(name).strip():
         raise ValueError("name must be non-empty")
-    coll = get_db().Division
-    try:
-        q = {"_id": ObjectId(division_id)}
-    except Exception:
-        q = {"_id": division_id}
+    coll = _divisions()
+    q = id_match(division_id)
     update = {"$set": {"name": str(name).strip()}}
     result = coll.find_one_and_update(q, update, return_document=ReturnDocument.AFTER)
-    if result is None:
-        try:
-            q = {"_id": division_id}
-            result = coll.find_one_and_update(q, update, return_document=ReturnDocument.AFTER)
-        except Exception:
-            pass
+    invalidate("Division")
     return result
 
 
 def delete_division(division_id: str) -> bool:
     """Delete one division from Scoring.Division. Removes this division_id from all entries' division_ids. Returns True if a document was deleted."""
-    db = get_db()
-    try:
-        oid = ObjectId(division_id)
-        div_id_str = str(oid)
-    except Exception:
-        div_id_str = str(division_id)
+    div_id_str = str(_coerce_id(division_id))
+
     # Remove this division from any entry's division_ids
-    db.Entry.update_many(
-        {"division_ids": div_id_str},
-        {"$pull": {"division_ids": div_id_str}},
-    )
-    try:
-        result = db.Division.delete_one({"_id": ObjectId(division_id)})
-        return result.deleted_count > 0
-    except Exception:
+    def pull_from_entries() -> Any:
+        return _entries().update_many(
+            {"division_ids": div_id_str},
+            {"$pull": {"division_ids": div_id_str}},
+        )
+
+    if not is_oid(div_id_str):
+        pull_from_entries()
+        invalidate("Entry")
         return False
+    # The $pull and the Division delete are independent: run them concurrently
+    _, result = run_concurrently(
+        pull_from_entries,
+        lambda: _divisions().delete_one({"_id": ObjectId(div_id_str)}),
+    )
+    invalidate("Entry", "Division")
+    return result.deleted_count > 0
 
 
 def insert_race(doc: dict[str, Any]) -> Any:
     """Insert one race into Scoring.RaceInfo. Returns inserted _id."""
-    return get_db().RaceInfo.insert_one(doc)
+    result = _races().insert_one(doc)
+    invalidate("RaceInfo")
+    return result
 
 
 def update_race(race_mongo_id: str, notes: str | None) -> dict[str, Any] | None:
     """Update a race's notes in Scoring.RaceInfo by _id. Returns updated document or None if not found."""
-    coll = get_db().RaceInfo
-    try:
-        oid = ObjectId(race_mongo_id)
-    except Exception:
+    coll = _races()
+    if not is_oid(str(race_mongo_id)):
         return None
+    oid = ObjectId(race_mongo_id)
     value = (notes if notes is not None else "").strip() if notes is not None else ""
     result = coll.find_one_and_update(
         {"_id": oid},
         {"$set": {"notes": value}},
         return_document=ReturnDocument.AFTER,
     )
+    invalidate("RaceInfo")
     return result
 
 
 def delete_race(race_mongo_id: str) -> bool:
     """Delete one race from Scoring.RaceInfo by _id, and all finishes for that race. Returns True if the race was deleted."""
-    db = get_db()
-    try:
-        oid = ObjectId(race_mongo_id)
-    except Exception:
+    if not is_oid(str(race_mongo_id)):
         return False
-    race = db.RaceInfo.find_one({"_id": oid})
+    oid = ObjectId(race_mongo_id)
+    race = _races().find_one({"_id": oid}, projection={"race_id": 1})
     if not race:
         return False
     race_id_str = str(race.get("race_id", ""))
-    db.ScoreSample.delete_many({"race_id": race_id_str})
-    result = db.RaceInfo.delete_one({"_id": oid})
+    # Finishes and the race itself are independent deletes: run them concurrently
+    _, result = run_concurrently(
+        lambda: _finishes().delete_many({"race_id": race_id_str}),
+        lambda: _races().delete_one({"_id": oid}),
+    )
+    invalidate("RaceInfo", "ScoreSample")
     return result.deleted_count > 0
 
 
 def insert_finish(doc: dict[str, Any]) -> Any:
     """Insert one finish into Scoring.ScoreSample. Returns inserted _id."""
-    return get_db().ScoreSample.insert_one(doc)
+    result = _finishes().insert_one(doc)
+    invalidate("ScoreSample")
+    return result
 
 
 def delete_finish(finish_mongo_id: str) -> bool:
     """Delete one finish from Scoring.ScoreSample by _id. Returns True if a document was deleted."""
-    try:
-        oid = ObjectId(finish_mongo_id)
-    except Exception:
+    if not is_oid(str(finish_mongo_id)):
         return False
-    result = get_db().ScoreSample.delete_one({"_id": oid})
+    oid = ObjectId(finish_mongo_id)
+    result = _finishes().delete_one({"_id": oid})
+    invalidate("ScoreSample")
     return result.deleted_count > 0
 
 
-def insert_events(docs: list[dict[str, Any]]) -> Any:
-    """Bulk insert events into Scoring.EventInfo. Returns insert result."""
+_BULK_CHUNK = 1000  # documents per insert_many call in the bulk helpers
+
+
+def _bulk_insert(
+    coll: Collection[dict[str, Any]],
+    docs: list[dict[str, Any]],
+    ordered: bool = False,
+    write_concern: WriteConcern | None = None,
+) -> list[Any]:
+    """
+    insert_many in chunks of _BULK_CHUNK. Unordered by default so one bad doc does not stop the rest.
+    write_concern (e.g. WriteConcern(w=0) for fire-and-forget imports) overrides the client default;
+    with w=0 the caller's invalidate() may run before the writes land (see insert_finishes_fast).
+    """
+    if write_concern is not None:
+        coll = coll.with_options(write_concern=write_concern)
+    return [
+        coll.insert_many(docs[i:i + _BULK_CHUNK], ordered=ordered)
+        for i in range(0, len(docs), _BULK_CHUNK)
+    ]
+
+
+def insert_events(
+    docs: list[dict[str, Any]],
+    ordered: bool = False,
+    write_concern: WriteConcern | None = None,
+) -> Any:
+    """Bulk insert events into Scoring.EventInfo. Returns the insert results (one per chunk)."""
     if not docs:
         return None
-    return get_db().EventInfo.insert_many(docs)
+    result = _bulk_insert(_events(), docs, ordered=ordered, write_concern=write_concern)
+    invalidate("EventInfo")
+    return result
 
 
-def insert_entries(docs: list[dict[str, Any]]) -> Any:
-    """Bulk insert entries into Scoring.Entry. Returns insert result."""
+def insert_entries(
+    docs: list[dict[str, Any]],
+    ordered: bool = False,
+    write_concern: WriteConcern | None = None,
+) -> Any:
+    """Bulk insert entries into Scoring.Entry. Returns the insert results (one per chunk)."""
     if not docs:
         return None
-    return get_db().Entry.insert_many(docs)
+    result = _bulk_insert(_entries(), docs, ordered=ordered, write_concern=write_concern)
+    invalidate("Entry")
+    return result
 
 
-def insert_races(docs: list[dict[str, Any]]) -> Any:
-    """Bulk insert races into Scoring.RaceInfo. Returns insert result."""
+def insert_races(
+    docs: list[dict[str, Any]],
+    ordered: bool = False,
+    write_concern: WriteConcern | None = None,
+) -> Any:
+    """Bulk insert races into Scoring.RaceInfo. Returns the insert results (one per chunk)."""
     if not docs:
         return None
-    return get_db().RaceInfo.insert_many(docs)
+    result = _bulk_insert(_races(), docs, ordered=ordered, write_concern=write_concern)
+    invalidate("RaceInfo")
+    return result
 
 
-def insert_finishes(docs: list[dict[str, Any]]) -> Any:
-    """Bulk insert finishes into Scoring.ScoreSample. Returns insert result."""
+def insert_finishes(
+    docs: list[dict[str, Any]],
+    ordered: bool = False,
+    write_concern: WriteConcern | None = None,
+) -> Any:
+    """Bulk insert finishes into Scoring.ScoreSample. Returns the insert results (one per chunk)."""
     if not docs:
         return None
-    return get_db().ScoreSample.insert_many(docs)
+    result = _bulk_insert(_finishes(), docs, ordered=ordered, write_concern=write_concern)
+    invalidate("ScoreSample")
+    return result
 
 
-# ---------- Result row dataclass ----------
+def insert_finishes_fast(docs: list[dict[str, Any]], batch_size: int = _BULK_CHUNK) -> None:
+    """
+    Fire-and-forget bulk insert of finishes (unordered InsertOne batches, w=0) for large imports.
+    The server does not acknowledge the writes, so failures (e.g. a bad document) are not reported;
+    use insert_finishes when that matters. It also returns before the server has applied them: the
+    invalidate("ScoreSample") at the end can run first, so a read right after may cache the old
+    finishes for up to CACHE_TTL_SECONDS. Import before serving results, or use insert_finishes.
+    """
+    if not docs:
+        return
+    coll = _finishes().with_options(write_concern=WriteConcern(w=0))
+    for i in range(0, len(docs), batch_size):
+        coll.bulk_write([InsertOne(d) for d in docs[i:i + batch_size]], ordered=False)
+    invalidate("ScoreSample")
+
 
+# ---------- Result row type ----------
 
-@dataclass
-class ScoringEntry:
-    """One result row: sail number, rank, scores with discard flags, total, net."""
+
+# Fields of a build_series_result row in ScoringEntry field order
+_GET_FIELDS = itemgetter("sail_number", "rank", "rank_display", "scores", "total", "net")
+
+
+class ScoringEntry(NamedTuple):
+    """One result row: sail number, rank, scores with discard flags, total, net (immutable, tuple-backed)."""
 
     sail_number: str
     rank: int
@@ -381,11 +538,4 @@ class ScoringEntry:
     @classmethod
     def from_result_row(cls, row: dict[str, Any]) -> "ScoringEntry":
         """Build from build_series_result row dict."""
-        return cls(
-            sail_number=row["sail_number"],
-            rank=row["rank"],
-            rank_display=row["rank_display"],
-            scores=row["scores"],
-            total=row["total"],
-            net=row["net"],
-        )
+        return cls._make(_GET_FIELDS(row))
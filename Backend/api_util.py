@@ -1,19 +1,38 @@
 """
-Utilities for Flask API: make MongoDB documents JSON-serializable (ObjectId -> str).
+Utilities for Flask API: JSON encoding of MongoDB documents (ObjectId -> str).
 """
 from __future__ import annotations
 
 from typing import Any
 
+import orjson
 from bson import ObjectId
+from flask.json.provider import DefaultJSONProvider
 
 
-def serialize_for_json(obj: Any) -> Any:
-    """Recursively convert ObjectId to string so jsonify works. In-place for dicts/lists."""
+def _orjson_default(obj: Any) -> Any:
+    """Types orjson does not encode itself: ObjectId, NamedTuple rows, then Flask's defaults (dates, Decimal, ...)."""
     if isinstance(obj, ObjectId):
         return str(obj)
-    if isinstance(obj, dict):
-        return {k: serialize_for_json(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [serialize_for_json(v) for v in obj]
-    return obj
+    if isinstance(obj, tuple):
+        return list(obj)
+    return DefaultJSONProvider.default(obj)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson (C encoder). ObjectIds are encoded as strings, so documents
+    can be passed to jsonify as-is. Honors sort_keys and the indented (debug) output.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Dates go through Flask's default so they keep the HTTP date format
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_orjson_default, option=option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
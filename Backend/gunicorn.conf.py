@@ -0,0 +1,15 @@
+"""
+gunicorn settings (picked up automatically from the working directory, e.g. `gunicorn main:app`).
+A gevent worker lets requests waiting on MongoDB yield to each other instead of blocking it
+(gunicorn monkey-patches the worker process before loading the app).
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+worker_class = "gevent"
+# Several processes so CPU-bound scoring (build_series_result) runs in parallel. Trade-off: the
+# load_* and result caches are per process (and per instance) and a write invalidates only the
+# worker that handled it, so other workers can serve reads up to CACHE_TTL_SECONDS old
+# (5 s; set CACHE_TTL_SECONDS=0 in the environment to turn the caches off)
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+worker_connections = 1000
@@ -1,12 +1,24 @@
-from flask import Flask, request, jsonify, Response
+import time
+
+from flask import Flask, request, jsonify, Response, g
 
 from flask_cors import CORS
 
 from DataAccess import (
+    CACHE_TTL_SECONDS,
+    ENTRY_SCORING_FIELDS,
+    EVENT_SCORING_FIELDS,
+    RACE_SCORING_FIELDS,
+    data_version,
+    fresh_reads,
+    is_oid,
+    run_concurrently,
     load_event_info,
+    load_event_by_id,
     load_entries,
     load_race_info,
     load_finishes,
+    load_finishes_for_event,
     load_divisions,
 )
 from ScoringEntry import (
@@ -23,6 +35,7 @@ from ScoringEntry import (
     update_entry,
     get_entry,
     entry_with_sail_number_exists,
+    sail_precheck_needed,
     insert_division,
     update_division,
     delete_division,
@@ -32,23 +45,54 @@ from ScoringEntry import (
     insert_finish,
     delete_finish,
 )
-from Calculation import build_series_result, to_csv_string
-from api_util import serialize_for_json
+from Calculation import build_series_result, iter_csv_lines, load_race_positions
+from api_util import OrjsonProvider
 
 app = Flask(__name__)
-CORS(app)
+# orjson encoder; also turns ObjectId into str, so documents are returned without conversion
+app.json = OrjsonProvider(app)
+# Only the JSON/CSV API is called cross-origin by the frontend
+CORS(app, resources={r"/api/*": {"origins": "*"}})
 
 
 def _str_id(doc: dict) -> str:
     return str(doc.get("_id", ""))
 
 
+MAX_DISCARD_VALUES = 100  # discard thresholds per event; bounds the work done on a request body
+
+
+def _parse_discard(discard) -> tuple[list[int] | None, str | None]:
+    """Validate a discard value (list of ints or "1, 2, 3"). Returns (discard, None) or (None, error message)."""
+    if discard is None:
+        return None, "discard is required"
+    if isinstance(discard, str):
+        try:
+            discard = [int(x.strip()) for x in discard.split(",") if x.strip()]
+        except ValueError:
+            return None, "discard must be comma-separated integers"
+    if not isinstance(discard, list):
+        return None, "discard must be a list of integers"
+    if len(discard) > MAX_DISCARD_VALUES:
+        return None, f"discard may have at most {MAX_DISCARD_VALUES} values"
+    # The items are type-checked once, by event_doc/update_event (ValueError -> 400)
+    return discard, None
+
+
+def _body() -> dict:
+    """Request JSON body (empty dict if null/empty JSON), evaluated once per request."""
+    if "_body" not in g:
+        # Not silent: a malformed body or non-JSON content type still aborts with 400/415
+        g._body = request.get_json() or {}
+    return g._body
+
+
 # ---------- Events ----------
 
 
 @app.route("/api/events", methods=["GET"])
 def get_events():
-    events = load_event_info()
+    events = load_event_info(projection={"_id": 1, "name": 1, "discard": 1})
     out = [{"id": _str_id(e), "name": e.get("name") or "", "discard": e.get("discard", [])} for e in events]
     out.sort(key=lambda x: x["id"], reverse=True)
     return jsonify(out)
@@ -59,33 +103,25 @@ def get_event(event_id):
     if not event_id or not event_id.strip():
         return jsonify({"error": "event_id is required"}), 400
     event_id = event_id.strip()
-    events = load_event_info()
-    event = next((e for e in events if _str_id(e) == event_id), None)
+    event = load_event_by_id(event_id)
     if event is None:
         return jsonify({"error": "Event not found"}), 404
     out = {"id": _str_id(event), "name": event.get("name") or "", "discard": event.get("discard", [])}
-    return jsonify(serialize_for_json(out))
+    return jsonify(out)
 
 
 @app.route("/api/events", methods=["POST"])
 def post_event():
-    data = request.get_json() or {}
-    discard = data.get("discard")
-    if discard is None:
-        return jsonify({"error": "discard is required"}), 400
-    if isinstance(discard, str):
-        try:
-            discard = [int(x.strip()) for x in discard.split(",") if x.strip()]
-        except ValueError:
-            return jsonify({"error": "discard must be comma-separated integers"}), 400
-    if not isinstance(discard, list) or not all(isinstance(x, int) for x in discard):
-        return jsonify({"error": "discard must be a list of integers"}), 400
+    data = _body()
+    discard, error = _parse_discard(data.get("discard"))
+    if error:
+        return jsonify({"error": error}), 400
     name = (data.get("name") or "").strip()
     try:
         doc = event_doc(discard, name=name)
         result = insert_event(doc)
         out = {"id": result.inserted_id, "name": doc.get("name") or "", "discard": doc["discard"]}
-        return jsonify(serialize_for_json(out)), 201
+        return jsonify(out), 201
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
@@ -95,17 +131,10 @@ def put_event(event_id):
     if not event_id or not event_id.strip():
         return jsonify({"error": "event_id is required"}), 400
     event_id = event_id.strip()
-    data = request.get_json() or {}
-    discard = data.get("discard")
-    if discard is None:
-        return jsonify({"error": "discard is required"}), 400
-    if isinstance(discard, str):
-        try:
-            discard = [int(x.strip()) for x in discard.split(",") if x.strip()]
-        except ValueError:
-            return jsonify({"error": "discard must be comma-separated integers"}), 400
-    if not isinstance(discard, list) or not all(isinstance(x, int) for x in discard):
-        return jsonify({"error": "discard must be a list of integers"}), 400
+    data = _body()
+    discard, error = _parse_discard(data.get("discard"))
+    if error:
+        return jsonify({"error": error}), 400
     name = data.get("name")
     if name is not None:
         name = (name or "").strip()
@@ -116,7 +145,7 @@ def put_event(event_id):
     if updated is None:
         return jsonify({"error": "Event not found"}), 404
     out = {"id": _str_id(updated), "name": updated.get("name") or "", "discard": updated.get("discard", [])}
-    return jsonify(serialize_for_json(out))
+    return jsonify(out)
 
 
 @app.route("/api/events/<event_id>", methods=["DELETE"])
@@ -124,9 +153,7 @@ def delete_event_route(event_id):
     if not event_id or not event_id.strip():
         return jsonify({"error": "event_id is required"}), 400
     event_id = event_id.strip()
-    events = load_event_info()
-    event = next((e for e in events if _str_id(e) == event_id), None)
-    if event is None:
+    if load_event_by_id(event_id) is None:
         return jsonify({"error": "Event not found"}), 404
     try:
         deleted = delete_event(event_id)
@@ -143,29 +170,28 @@ def delete_event_route(event_id):
 @app.route("/api/entries", methods=["GET"])
 def get_entries():
     event_id = request.args.get("event_id")
-    entries = load_entries()
-    if event_id is not None and event_id != "":
-        entries = [e for e in entries if str(e.get("event_id", "")) == str(event_id)]
-    out = serialize_for_json(entries)
-    return jsonify(out)
+    entries = load_entries(event_id=event_id or None)
+    return jsonify(entries)
 
 
 @app.route("/api/entries", methods=["POST"])
 def post_entry():
-    data = request.get_json() or {}
+    data = _body()
     event_id = (data.get("event_id") or "").strip()
     sail_number = (data.get("sail_number") or "").strip()
     name = (data.get("name") or "").strip()
     division_ids = data.get("division_ids")
     if division_ids is not None and not isinstance(division_ids, list):
         division_ids = None
-    if entry_with_sail_number_exists(event_id, sail_number):
+    # Normally the unique index rejects duplicates inside insert_entry; the precheck only runs
+    # for events it does not fully cover yet (entries not backfilled, index not unique)
+    if sail_precheck_needed(event_id) and entry_with_sail_number_exists(event_id, sail_number):
         return jsonify({"error": "Duplicate sail number"}), 400
     try:
         doc = entry_doc(event_id, sail_number, name=name, division_ids=division_ids)
         result = insert_entry(doc)
         out = {**doc, "_id": str(result.inserted_id)}
-        return jsonify(serialize_for_json(out)), 201
+        return jsonify(out), 201
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
@@ -174,6 +200,8 @@ def post_entry():
 def delete_entry_route(entry_id):
     if not entry_id or not entry_id.strip():
         return jsonify({"error": "entry_id is required"}), 400
+    if not is_oid(entry_id.strip()):
+        return jsonify({"error": "invalid id"}), 400
     deleted = delete_entry(entry_id.strip())
     if not deleted:
         return jsonify({"error": "Entry not found"}), 404
@@ -185,19 +213,26 @@ def patch_entry(entry_id):
     if not entry_id or not entry_id.strip():
         return jsonify({"error": "entry_id is required"}), 400
     entry_id = entry_id.strip()
-    data = request.get_json() or {}
+    if not is_oid(entry_id):
+        return jsonify({"error": "invalid id"}), 400
+    data = _body()
     if "sail_number" in data:
         sail_number = (data.get("sail_number") or "").strip()
-        if sail_number:
+        # Same as POST: update_entry maps the unique index's DuplicateKeyError to a 400
+        if sail_number and sail_precheck_needed():
             existing = get_entry(entry_id)
-            if existing and entry_with_sail_number_exists(
-                existing.get("event_id", ""), sail_number, exclude_entry_id=entry_id
+            event_id = existing.get("event_id", "") if existing else ""
+            if existing and sail_precheck_needed(event_id) and entry_with_sail_number_exists(
+                event_id, sail_number, exclude_entry_id=entry_id
             ):
                 return jsonify({"error": "Duplicate sail number"}), 400
-    updated = update_entry(entry_id, data)
+    try:
+        updated = update_entry(entry_id, data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     if updated is None:
         return jsonify({"error": "Entry not found"}), 404
-    return jsonify(serialize_for_json(updated))
+    return jsonify(updated)
 
 
 # ---------- Divisions ----------
@@ -206,23 +241,20 @@ def patch_entry(entry_id):
 @app.route("/api/divisions", methods=["GET"])
 def get_divisions():
     event_id = request.args.get("event_id")
-    divisions = load_divisions()
-    if event_id is not None and event_id != "":
-        divisions = [d for d in divisions if str(d.get("event_id", "")) == str(event_id)]
-    out = serialize_for_json(divisions)
-    return jsonify(out)
+    divisions = load_divisions(event_id=event_id or None)
+    return jsonify(divisions)
 
 
 @app.route("/api/divisions", methods=["POST"])
 def post_division():
-    data = request.get_json() or {}
+    data = _body()
     event_id = (data.get("event_id") or "").strip()
     name = (data.get("name") or "").strip()
     try:
         doc = division_doc(event_id, name)
         result = insert_division(doc)
         out = {**doc, "_id": str(result.inserted_id)}
-        return jsonify(serialize_for_json(out)), 201
+        return jsonify(out), 201
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
@@ -232,7 +264,9 @@ def put_division(division_id):
     if not division_id or not division_id.strip():
         return jsonify({"error": "division_id is required"}), 400
     division_id = division_id.strip()
-    data = request.get_json() or {}
+    if not is_oid(division_id):
+        return jsonify({"error": "invalid id"}), 400
+    data = _body()
     name = (data.get("name") or "").strip()
     if not name:
         return jsonify({"error": "name is required"}), 400
@@ -243,13 +277,15 @@ def put_division(division_id):
     if updated is None:
         return jsonify({"error": "Division not found"}), 404
     out = {"_id": _str_id(updated), "event_id": updated.get("event_id"), "name": updated.get("name")}
-    return jsonify(serialize_for_json(out))
+    return jsonify(out)
 
 
 @app.route("/api/divisions/<division_id>", methods=["DELETE"])
 def delete_division_route(division_id):
     if not division_id or not division_id.strip():
         return jsonify({"error": "division_id is required"}), 400
+    if not is_oid(division_id.strip()):
+        return jsonify({"error": "invalid id"}), 400
     deleted = delete_division(division_id.strip())
     if not deleted:
         return jsonify({"error": "Division not found"}), 404
@@ -262,15 +298,13 @@ def delete_division_route(division_id):
 @app.route("/api/races", methods=["GET"])
 def get_races():
     event_id = request.args.get("event_id")
-    races = load_race_info()
-    if event_id is not None and event_id != "":
-        races = [r for r in races if str(r.get("event_id", "")) == str(event_id)]
-    return jsonify(serialize_for_json(races))
+    races = load_race_info(event_id=event_id or None)
+    return jsonify(races)
 
 
 @app.route("/api/races", methods=["POST"])
 def post_race():
-    data = request.get_json() or {}
+    data = _body()
     event_id = (data.get("event_id") or "").strip()
     race_id = (data.get("race_id") or "").strip()
     start_time = (data.get("start_time") or "").strip()
@@ -278,7 +312,7 @@ def post_race():
         doc = race_doc(event_id, race_id, start_time)
         result = insert_race(doc)
         out = {**doc, "_id": str(result.inserted_id)}
-        return jsonify(serialize_for_json(out)), 201
+        return jsonify(out), 201
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
@@ -287,7 +321,9 @@ def post_race():
 def patch_race(race_mongo_id):
     if not race_mongo_id or not race_mongo_id.strip():
         return jsonify({"error": "race_mongo_id is required"}), 400
-    data = request.get_json() or {}
+    if not is_oid(race_mongo_id.strip()):
+        return jsonify({"error": "invalid id"}), 400
+    data = _body()
     notes = data.get("notes")
     if notes is not None and not isinstance(notes, str):
         notes = str(notes)
@@ -301,13 +337,15 @@ def patch_race(race_mongo_id):
         "start_time": updated.get("start_time"),
         "notes": updated.get("notes", ""),
     }
-    return jsonify(serialize_for_json(out))
+    return jsonify(out)
 
 
 @app.route("/api/races/<race_id>", methods=["DELETE"])
 def delete_race_route(race_id):
     if not race_id or not race_id.strip():
         return jsonify({"error": "race_id is required"}), 400
+    if not is_oid(race_id.strip()):
+        return jsonify({"error": "invalid id"}), 400
     deleted = delete_race(race_id.strip())
     if not deleted:
         return jsonify({"error": "Race not found"}), 404
@@ -321,19 +359,19 @@ def delete_race_route(race_id):
 def get_finishes():
     race_id = request.args.get("race_id")
     event_id = request.args.get("event_id")
-    finishes = load_finishes()
     if event_id is not None and event_id != "":
-        races = load_race_info()
-        race_ids = {str(r.get("race_id", "")) for r in races if str(r.get("event_id", "")) == str(event_id)}
-        finishes = [f for f in finishes if str(f.get("race_id", "")) in race_ids]
-    if race_id is not None and race_id != "":
-        finishes = [f for f in finishes if str(f.get("race_id", "")) == str(race_id)]
-    return jsonify(serialize_for_json(finishes))
+        # Both filters go into the one aggregation
+        finishes = load_finishes_for_event(event_id, race_id=race_id or None)
+    elif race_id is not None and race_id != "":
+        finishes = load_finishes(race_ids=[race_id])
+    else:
+        finishes = load_finishes()
+    return jsonify(finishes)
 
 
 @app.route("/api/finishes", methods=["POST"])
 def post_finish():
-    data = request.get_json() or {}
+    data = _body()
     sail_number = (data.get("sail_number") or "").strip()
     race_id = (data.get("race_id") or "").strip()
     finish_time = (data.get("finish_time") or "").strip()
@@ -344,13 +382,15 @@ def post_finish():
         doc = finish_doc(sail_number, race_id, finish_time, rc_scoring=rc_scoring)
         result = insert_finish(doc)
         out = {**doc, "_id": str(result.inserted_id)}
-        return jsonify(serialize_for_json(out)), 201
+        return jsonify(out), 201
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
 
 @app.route("/api/finishes/<finish_id>", methods=["DELETE"])
 def delete_finish_route(finish_id: str):
+    if not is_oid(finish_id):
+        return jsonify({"error": "invalid id"}), 400
     if delete_finish(finish_id):
         return "", 204
     return jsonify({"error": "Finish not found"}), 404
@@ -359,22 +399,42 @@ def delete_finish_route(finish_id: str):
 # ---------- Results ----------
 
 
+# Computed results: (event_id, division_id, data_version) -> (stored_at, (rows, race_ids, event_info)).
+# Any write bumps data_version, so stale keys are never hit again; the dict is cleared when full.
+_RESULT_CACHE: dict[tuple, tuple[float, tuple]] = {}
+RESULT_CACHE_MAX = 512
+
+
 def _event_result(event_id: str, division_id: str | None = None):
-    events = load_event_info()
-    event_info = next((e for e in events if str(e.get("_id", "")) == str(event_id)), None)
+    key = (str(event_id), (division_id or "").strip(), data_version())
+    now = time.monotonic()
+    hit = _RESULT_CACHE.get(key)
+    if hit is not None and now - hit[0] < CACHE_TTL_SECONDS:
+        # Shared with other requests: callers only read the rows
+        return hit[1]
+    # Built from uncached loads, so a cached result is never more than the TTL old
+    with fresh_reads():
+        result = _compute_event_result(event_id, division_id)
+    if len(_RESULT_CACHE) >= RESULT_CACHE_MAX:
+        _RESULT_CACHE.clear()
+    _RESULT_CACHE[key] = (now, result)
+    return result
+
+
+def _compute_event_result(event_id: str, division_id: str | None = None):
+    div_id = division_id.strip() if division_id is not None and division_id.strip() != "" else None
+    # Event, entries and races are independent reads: issue them concurrently
+    event_info, entries, races = run_concurrently(
+        lambda: load_event_by_id(event_id, projection=EVENT_SCORING_FIELDS),
+        lambda: load_entries(event_id=event_id, projection=ENTRY_SCORING_FIELDS, division_id=div_id),
+        lambda: load_race_info(event_id=event_id, projection=RACE_SCORING_FIELDS),
+    )
     if not event_info:
         return None, None, None
-    entries = load_entries()
-    entries = [e for e in entries if str(e.get("event_id", "")) == str(event_id)]
-    if division_id is not None and division_id.strip() != "":
-        div_id = str(division_id).strip()
-        entry_division_ids = lambda e: e.get("division_ids") or []
-        entries = [e for e in entries if div_id in entry_division_ids(e)]
-    races_list = load_race_info()
-    races = [r for r in races_list if str(r.get("event_id", "")) == str(event_id)]
-    finishes = load_finishes()
-    rows = build_series_result(event_id, entries, races, finishes, event_info)
     race_ids = [r["race_id"] for r in races]
+    # Finish positions are ranked per race by MongoDB; scoring, discards and ties stay in Python
+    positions = load_race_positions(race_ids)
+    rows = build_series_result(event_id, entries, races, [], event_info, positions=positions)
     return rows, race_ids, event_info
 
 
@@ -384,7 +444,7 @@ def get_result_json(event_id):
     rows, race_ids, _ = _event_result(event_id, division_id=division_id)
     if rows is None:
         return jsonify({"error": "Event not found"}), 404
-    return jsonify(serialize_for_json(rows))
+    return jsonify(rows)
 
 
 @app.route("/api/results/<event_id>/csv", methods=["GET"])
@@ -393,8 +453,8 @@ def get_result_csv_route(event_id):
     rows, race_ids, _ = _event_result(event_id, division_id=division_id)
     if rows is None:
         return jsonify({"error": "Event not found"}), 404
-    csv_str = to_csv_string(rows, race_ids)
-    return Response(csv_str, mimetype="text/plain", headers={"Content-Disposition": "inline"})
+    # Streamed line by line instead of building the whole CSV string first
+    return Response(iter_csv_lines(rows, race_ids), mimetype="text/csv", headers={"Content-Disposition": "inline"})
 
 
 @app.route("/")
@@ -0,0 +1,102 @@
+"""
+One-time script: set Entry.sail_number_normalized on entries created before that field existed,
+so the indexed duplicate sail number check sees them, then make the (event_id,
+sail_number_normalized) index unique if it is not yet and drop the redundant Entry(event_id)
+index (the backend only creates indexes).
+Run from Backend: python scripts/backfill_sail_number_normalized.py
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure Backend is on path and load .env from Backend
+_backend = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_backend))
+
+from dotenv import load_dotenv
+
+load_dotenv(_backend / ".env")
+
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, OperationFailure
+
+from DataAccess import SAIL_INDEX_KEY, SAIL_INDEX_OPTIONS, get_db
+from ScoringEntry import _normalize_sail
+
+SAIL_INDEX_NAME = "event_id_1_sail_number_normalized_1"
+
+
+def backfill(coll: Collection) -> None:
+    legacy = list(coll.find({"sail_number_normalized": {"$exists": False}}, {"event_id": 1, "sail_number": 1}))
+    if not legacy:
+        print("Entry: nothing to backfill")
+        return
+    ops = [
+        UpdateOne(
+            {"_id": doc["_id"]},
+            {"$set": {"sail_number_normalized": _normalize_sail(str(doc.get("sail_number") or ""))}},
+        )
+        for doc in legacy
+    ]
+    try:
+        result = coll.bulk_write(ops, ordered=False)
+        print(f"Entry: updated {result.modified_count} documents")
+    except BulkWriteError as e:
+        # Unordered: every other entry was updated. The rest repeat a sail number already in their
+        # event (unique index); they keep no sail_number_normalized until the duplicate is resolved.
+        print(f"Entry: updated {e.details.get('nModified', 0)} documents")
+        for err in e.details.get("writeErrors", []):
+            doc = legacy[err["index"]]
+            print(
+                f"  not updated: _id={doc['_id']} event_id={doc.get('event_id')} "
+                f"sail_number={doc.get('sail_number')!r}: {err.get('errmsg', '')}"
+            )
+
+
+def make_sail_index_unique(coll: Collection) -> None:
+    index = coll.index_information().get(SAIL_INDEX_NAME)
+    if index is not None and index.get("unique"):
+        print("Entry: sail number index is already unique")
+        return
+    if index is not None:
+        # Same name and keys with different options: the non-unique index has to go first
+        coll.drop_index(SAIL_INDEX_NAME)
+    try:
+        coll.create_index(SAIL_INDEX_KEY, **SAIL_INDEX_OPTIONS)
+        print("Entry: sail number index is now unique")
+        return
+    except OperationFailure:
+        coll.create_index(SAIL_INDEX_KEY)
+    print("Entry: sail number index left non-unique; remove these duplicates and run again:")
+    duplicates = coll.aggregate([
+        {"$match": {"sail_number_normalized": {"$exists": True}}},
+        {"$group": {
+            "_id": {"event_id": "$event_id", "sail": "$sail_number_normalized"},
+            "ids": {"$push": "$_id"},
+        }},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ])
+    for dup in duplicates:
+        ids = ", ".join(str(i) for i in dup["ids"])
+        print(f"  event_id={dup['_id']['event_id']} sail_number={dup['_id']['sail']!r}: {ids}")
+
+
+def drop_redundant_indexes(coll: Collection) -> None:
+    # event_id alone is a prefix of (event_id, division_ids), which the backend creates
+    if "event_id_1" in coll.index_information():
+        coll.drop_index("event_id_1")
+        print("Entry: dropped index event_id_1 (covered by event_id_1_division_ids_1)")
+
+
+def main() -> None:
+    coll = get_db().Entry
+    backfill(coll)
+    make_sail_index_unique(coll)
+    drop_redundant_indexes(coll)
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,6 @@ Run from Backend: python scripts/import_json_to_mongo.py
 """
 from __future__ import annotations
 
-import json
 import sys
 from pathlib import Path
 
@@ -13,11 +12,16 @@ from pathlib import Path
 _backend = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(_backend))
 
+import orjson
 from dotenv import load_dotenv
+from pymongo.errors import BulkWriteError
 
 load_dotenv(_backend / ".env")
 
 from DataAccess import get_db
+from ScoringEntry import _normalize_sail
+
+BATCH_SIZE = 1000
 
 
 def main() -> None:
@@ -36,14 +40,31 @@ def main() -> None:
         if not path.exists():
             print(f"Skip {filename}: not found")
             continue
-        with path.open(encoding="utf-8") as f:
-            docs = json.load(f)
+        docs = orjson.loads(path.read_bytes())
         if not docs:
             print(f"{collection_name}: no documents")
             continue
+        if collection_name == "Entry":
+            for doc in docs:
+                doc.setdefault("sail_number_normalized", _normalize_sail(str(doc.get("sail_number") or "")))
         coll = db[collection_name]
-        result = coll.insert_many(docs)
-        print(f"{collection_name}: inserted {len(result.inserted_ids)} documents")
+        inserted = 0
+        skipped = 0
+        # Unordered batches: the server applies each batch in any order and a duplicate _id
+        # (e.g. re-running the import) skips only that document
+        for i in range(0, len(docs), BATCH_SIZE):
+            try:
+                result = coll.insert_many(
+                    docs[i:i + BATCH_SIZE], ordered=False, bypass_document_validation=True
+                )
+                inserted += len(result.inserted_ids)
+            except BulkWriteError as e:
+                inserted += e.details.get("nInserted", 0)
+                skipped += len(e.details.get("writeErrors", []))
+        msg = f"{collection_name}: inserted {inserted} documents"
+        if skipped:
+            msg += f" ({skipped} skipped: duplicate or invalid)"
+        print(msg)
 
     print("Done.")
 
@@ -1,10 +1,33 @@
 """
-Test creating the sailing result CSV from JSON data.
+Test creating the sailing result CSV from JSON data, and the scoring rules on in-memory data
+(every test except test_create_csv runs without a database).
 Run: python test_calculation.py
 """
+import random
+from operator import itemgetter
 from pathlib import Path
 
-from Calculation import generate_result_csv_for_event
+from Calculation import (
+    build_series_result,
+    generate_result_csv_for_event,
+    iter_csv_lines,
+    positions_from_finishes,
+    positions_from_ranked,
+    to_csv_string,
+    total_and_net,
+)
+
+
+def _entries(*sail_numbers):
+    return [{"event_id": "E", "sail_number": sn, "name": ""} for sn in sail_numbers]
+
+
+def _races(*race_ids):
+    return [{"event_id": "E", "race_id": rid, "start_time": f"{10 + i}:00"} for i, rid in enumerate(race_ids)]
+
+
+def _scores(row):
+    return [score for score, _discarded, _rc in row["scores"]]
 
 
 def test_create_csv():
@@ -25,5 +48,132 @@ def test_create_csv():
     print(content)
 
 
+def test_iter_csv_lines_matches_to_csv_string():
+    """Streaming CSV lines join to the same content as to_csv_string (no database needed)."""
+    entries = [{"event_id": "E", "sail_number": sn, "name": f"Boat, {sn}"} for sn in ("1", "2", "3")]
+    races = [{"event_id": "E", "race_id": r, "start_time": t} for r, t in (("1", "10:00"), ("2", "11:00"))]
+    finishes = [
+        {"sail_number": "1", "race_id": "1", "finish_time": "10:30"},
+        {"sail_number": "2", "race_id": "1", "finish_time": "10:20"},
+        {"sail_number": "1", "race_id": "2", "finish_time": "11:10"},
+        {"sail_number": "3", "race_id": "2", "finish_time": "11:05", "rc_scoring": "OCS"},
+    ]
+    rows = build_series_result("E", entries, races, finishes, {"discard": [2]})
+    race_ids = [r["race_id"] for r in races]
+
+    lines = list(iter_csv_lines(rows, race_ids))
+    assert len(lines) == len(rows) + 1
+    assert "".join(lines) == to_csv_string(rows, race_ids)
+
+
+def test_repeated_race_id_scores_both_columns():
+    """A race_id listed twice gets the same score in both columns (no database needed)."""
+    finishes = [
+        {"sail_number": "A", "race_id": "1", "finish_time": "10:10"},
+        {"sail_number": "B", "race_id": "1", "finish_time": "10:05"},
+        {"sail_number": "A", "race_id": "2", "finish_time": "11:10"},
+    ]
+    rows = build_series_result("E", _entries("A", "B"), _races("1", "2", "1"), finishes, {"discard": []})
+    by_sail = {row["sail_number"]: row for row in rows}
+    assert _scores(by_sail["A"]) == [2.0, 1.0, 2.0]
+    # B missed race 2: DNC, n_boats + 1
+    assert _scores(by_sail["B"]) == [1.0, 3.0, 1.0]
+    assert by_sail["B"]["scores"][1][2] == "DNC"
+    # Tied on 5.0; A8.1 (1, 1, 3) beats (1, 2, 2)
+    assert [row["sail_number"] for row in rows] == ["B", "A"]
+
+
+def test_rc_scoring_takes_penalty_and_no_position():
+    """Finishes with an rc_scoring code score n_boats + 1 and do not take a position."""
+    finishes = [
+        {"sail_number": "A", "race_id": "1", "finish_time": "10:01", "rc_scoring": " OCS "},
+        {"sail_number": "B", "race_id": "1", "finish_time": "10:05"},
+        {"sail_number": "C", "race_id": "1", "finish_time": "10:06", "rc_scoring": ""},
+    ]
+    positions, rc_finishes = positions_from_finishes(finishes, ["1"])
+    assert positions == {"B": [1.0], "C": [2.0]}
+    assert rc_finishes == [("A", "1", "OCS")]
+
+    rows = build_series_result("E", _entries("A", "B", "C"), _races("1"), finishes, {"discard": []})
+    assert [(row["sail_number"], _scores(row)) for row in rows] == [("B", [1.0]), ("C", [2.0]), ("A", [4.0])]
+    assert rows[2]["scores"][0][2] == "OCS"
+
+
+def test_discard_ties_drop_the_later_race():
+    """Equal worst scores: the later race is discarded."""
+    total, net, is_discarded = total_and_net([3.0, 1.0, 3.0], 1)
+    assert (total, net, is_discarded) == (7.0, 4.0, [False, False, True])
+    total, net, is_discarded = total_and_net([3.0, None, 3.0, 2.0], 5)
+    assert (total, net, is_discarded) == (8.0, 0.0, [True, False, True, True])
+
+
+def test_a8_breaks_net_ties():
+    """Tied on NET: A8.1 (non-discarded scores, best first), then A8.2 (last race first, discards included)."""
+    # A8.1 decides: (1, 2, 3) vs (1, 1, 4)
+    positions = ({"A": [1.0, 2.0, 3.0], "B": [1.0, 4.0, 1.0]}, [])
+    rows = build_series_result("E", _entries("A", "B"), _races("1", "2", "3"), [], {}, positions=positions)
+    assert [row["sail_number"] for row in rows] == ["B", "A"]
+
+    # One discard; both net 3.0 with A8.1 (1, 2). A8.2 compares the last race: A 2.0, B 5.0 (discarded)
+    positions = ({"A": [1.0, 4.0, 2.0], "B": [2.0, 1.0, 5.0]}, [])
+    rows = build_series_result(
+        "E", _entries("B", "A"), _races("1", "2", "3"), [], {"discard": [3]}, positions=positions
+    )
+    assert [(row["sail_number"], row["net"]) for row in rows] == [("A", 3.0), ("B", 3.0)]
+    assert [discarded for _score, discarded, _rc in rows[1]["scores"]] == [False, False, True]
+    assert [row["rank_display"] for row in rows] == ["1st", "2nd"]
+
+
+def _rank_like_load_positions(finishes, race_ids):
+    """What DataAccess.load_positions returns: non-rc finishes numbered per race by (finish_time, insertion order)."""
+    ranked = []
+    for rid in dict.fromkeys(race_ids):
+        normal = [
+            (f["finish_time"], seq, f)
+            for seq, f in enumerate(finishes)
+            if f["race_id"] == rid and not f.get("rc_scoring")
+        ]
+        for position, (_ft, _seq, f) in enumerate(sorted(normal, key=itemgetter(0, 1)), start=1):
+            ranked.append({"sail_number": f.get("sail_number"), "race_id": rid, "position": position})
+    return ranked
+
+
+def test_positions_from_ranked_matches_positions_from_finishes():
+    """Server-side ranking (emulated) gives the same positions and results as ranking in Python."""
+    for seed in range(200):
+        rng = random.Random(seed)
+        sails = [str(n) for n in range(1, rng.randint(2, 8))]
+        race_ids = [str(r) for r in range(1, rng.randint(2, 6))]
+        race_order = race_ids + rng.sample(race_ids, rng.randint(0, min(2, len(race_ids))))
+        finishes = []
+        for _ in range(rng.randint(0, 40)):
+            f = {
+                "sail_number": rng.choice(sails + [None]),
+                "race_id": rng.choice(race_ids + ["X"]),  # X: not one of the event's races
+                "finish_time": f"10:{rng.randint(0, 9):02d}",
+            }
+            if rng.random() < 0.2:
+                f["rc_scoring"] = rng.choice(["OCS", "DNF", " DSQ", ""])
+            finishes.append(f)
+        rc_finishes = [f for f in finishes if f.get("rc_scoring") and f["race_id"] in race_order]
+
+        expected = positions_from_finishes(finishes, race_order)
+        actual = positions_from_ranked(_rank_like_load_positions(finishes, race_order), rc_finishes, race_order)
+        assert actual[0] == expected[0], seed
+        assert sorted(actual[1]) == sorted(expected[1]), seed
+
+        entries = _entries(*sails)
+        races = [{"event_id": "E", "race_id": rid} for rid in race_order]
+        event_info = {"discard": [2, 4]}
+        from_ranked = build_series_result("E", entries, races, [], event_info, positions=actual)
+        assert from_ranked == build_series_result("E", entries, races, finishes, event_info), seed
+
+
 if __name__ == "__main__":
     test_create_csv()
+    test_iter_csv_lines_matches_to_csv_string()
+    test_repeated_race_id_scores_both_columns()
+    test_rc_scoring_takes_penalty_and_no_position()
+    test_discard_ties_drop_the_later_race()
+    test_a8_breaks_net_ties()
+    test_positions_from_ranked_matches_positions_from_finishes()
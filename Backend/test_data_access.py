@@ -0,0 +1,47 @@
+"""
+Test the in-process load_* cache in DataAccess (no database needed).
+Run: python test_data_access.py
+"""
+import DataAccess
+from DataAccess import _cached, invalidate
+
+
+def test_write_during_read_is_not_cached_over():
+    """A read that overlaps a write is returned but not cached, so the next read sees the write."""
+    db = {"n": 0}
+    calls = []
+
+    @_cached("Test")
+    def load():
+        calls.append(1)
+        result = db["n"]
+        if len(calls) == 1:
+            # A write (and its invalidate) lands after this read queried the database
+            db["n"] = 1
+            invalidate("Test")
+        return result
+
+    assert load() == 0
+    assert load() == 1
+    assert load() == 1
+    assert len(calls) == 2
+
+
+def test_cache_is_bounded():
+    """Distinct arguments never grow the cache past CACHE_MAX_ENTRIES."""
+    invalidate()
+
+    @_cached("Test")
+    def load(key):
+        return key
+
+    for key in range(DataAccess.CACHE_MAX_ENTRIES + 100):
+        assert load(key) == key
+    assert len(DataAccess._cache) == DataAccess.CACHE_MAX_ENTRIES
+    invalidate("Test")
+    assert not DataAccess._cache
+
+
+if __name__ == "__main__":
+    test_write_during_read_is_not_cached_over()
+    test_cache_is_bounded()